@@ -0,0 +1,273 @@
+"""Offline benchmark of the integration with synthetic households.
+
+Sets up the integration in a throwaway Home Assistant instance against a
+fake Sure Petcare api and measures the setup time, the memory per entity,
+the CPU time and the state writes per refresh.
+
+    python benchmarks/benchmark.py --households 10 --pets 30
+    python benchmarks/benchmark.py --save baseline.json
+    python benchmarks/benchmark.py --compare baseline.json --tolerance 0.2
+
+Needs Home Assistant and surepy installed. With ``--compare`` the exit code
+is 1 if a metric is worse than the baseline by more than the tolerance and
+2 if the baseline was measured with other parameters.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from functools import partial
+import gc
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+from time import perf_counter, process_time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+# import the integration from this checkout
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from homeassistant import config_entries, loader  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, HomeAssistant, callback  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    issue_registry as ir,
+    template,
+)
+
+from benchmarks.fake_surepy import FakeApi, FakeSurepy  # noqa: E402
+from custom_components.sureha.const import DOMAIN  # noqa: E402
+
+# metrics where a lower value is better, compared against a baseline
+COMPARED = [
+    "setup_seconds",
+    "memory_per_entity_bytes",
+    "refresh_cpu_ms_mean",
+    "refresh_cpu_ms_p95",
+    "idle_refresh_cpu_ms_mean",
+    "state_writes_per_refresh",
+    "idle_state_writes_per_refresh",
+]
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a minimal Home Assistant without any integration set up."""
+
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+
+    loader.async_setup(hass)
+    entity.async_setup(hass)
+    template.async_setup(hass)
+
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await ir.async_load(hass)
+
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+
+    return hass
+
+
+async def async_refreshes(
+    hass: HomeAssistant, api: FakeApi, entry_id: str, count: int, moves: int
+) -> tuple[list[float], list[int]]:
+    """Refresh a number of times, return the CPU times and state writes."""
+
+    coordinator = hass.data[DOMAIN][entry_id].coordinator
+    writes = 0
+
+    @callback
+    def count_write(_: Event) -> None:
+        nonlocal writes
+        writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, count_write)
+    cpu_times: list[float] = []
+    state_writes: list[int] = []
+
+    for _ in range(count):
+        api.tick(moves)
+        writes = 0
+
+        started = process_time()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        cpu_times.append((process_time() - started) * 1000)
+
+        state_writes.append(writes)
+
+    unsub()
+
+    return cpu_times, state_writes
+
+
+async def async_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark and return the results."""
+
+    api = FakeApi(
+        households=args.households,
+        pets=args.pets,
+        flaps=args.flaps,
+        feeders=args.feeders,
+        felaquas=args.felaquas,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory() as config_dir, patch(
+        "custom_components.sureha.Surepy", partial(FakeSurepy, api)
+    ):
+        hass = await async_start_hass(config_dir)
+
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Sure Petcare",
+            data={CONF_USERNAME: "user", CONF_PASSWORD: "pass", CONF_TOKEN: "tok"},
+            source=config_entries.SOURCE_USER,
+            options=args.options,
+        )
+
+        gc.collect()
+        tracemalloc.start()
+        memory = tracemalloc.get_traced_memory()[0]
+        started = perf_counter()
+
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+
+        setup_seconds = perf_counter() - started
+        gc.collect()
+        memory = tracemalloc.get_traced_memory()[0] - memory
+        tracemalloc.stop()
+
+        entities = len(
+            er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        )
+
+        cpu_times, state_writes = await async_refreshes(
+            hass, api, entry.entry_id, args.refreshes, args.moves
+        )
+        idle_cpu_times, idle_state_writes = await async_refreshes(
+            hass, api, entry.entry_id, args.refreshes, 0
+        )
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+
+    return {
+        "parameters": parameters(args),
+        "surepy_entities": len(api.raw_entities),
+        "entities": entities,
+        "setup_seconds": round(setup_seconds, 3),
+        "memory_per_entity_bytes": round(memory / max(entities, 1)),
+        "refresh_cpu_ms_mean": round(statistics.mean(cpu_times), 2),
+        "refresh_cpu_ms_p95": round(max(statistics.quantiles(cpu_times, n=20)), 2),
+        "idle_refresh_cpu_ms_mean": round(statistics.mean(idle_cpu_times), 2),
+        "state_writes_per_refresh": round(statistics.mean(state_writes), 1),
+        "idle_state_writes_per_refresh": round(statistics.mean(idle_state_writes), 1),
+        "api_requests": api.requests,
+    }
+
+
+def parameters(args: argparse.Namespace) -> dict[str, Any]:
+    """Return the parameters the results depend on."""
+    return {
+        name: getattr(args, name)
+        for name in [
+            "households",
+            "pets",
+            "flaps",
+            "feeders",
+            "felaquas",
+            "refreshes",
+            "moves",
+            "seed",
+            "options",
+        ]
+    }
+
+
+def regressions(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return the metrics that are worse than the baseline."""
+
+    return [
+        f"{metric}: {baseline[metric]} -> {results[metric]}"
+        for metric in COMPARED
+        if metric in baseline
+        and results[metric] > baseline[metric] * (1 + tolerance)
+        # ignore noise of values close to zero
+        and results[metric] - baseline[metric] > 0.5
+    ]
+
+
+def main() -> int:
+    """Parse the arguments and run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--households", type=int, default=10)
+    parser.add_argument("--pets", type=int, default=20, help="per household")
+    parser.add_argument("--flaps", type=int, default=2, help="per household")
+    parser.add_argument("--feeders", type=int, default=4, help="per household")
+    parser.add_argument("--felaquas", type=int, default=2, help="per household")
+    parser.add_argument("--refreshes", type=int, default=20, help="at least 2")
+    parser.add_argument(
+        "--moves", type=int, default=5, help="pets moving between two refreshes"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--options", type=json.loads, default={}, help="config entry options as JSON"
+    )
+    parser.add_argument("--save", type=Path, help="write the results to a file")
+    parser.add_argument("--compare", type=Path, help="compare with saved results")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+
+    results = asyncio.run(async_benchmark(args))
+
+    for metric, value in results.items():
+        if metric != "parameters":
+            print(f"{metric:32} {value}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+
+        if baseline.get("parameters") != results["parameters"]:
+            print(f"\n{args.compare} was measured with other parameters")
+            return 2
+
+        if worse := regressions(results, baseline, args.tolerance):
+            print("\nregressions:\n  " + "\n  ".join(worse))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
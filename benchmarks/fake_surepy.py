@@ -0,0 +1,308 @@
+"""A fake Sure Petcare api serving synthetic households, nothing talks to the cloud."""
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any
+
+from surepy.const import MESTART_RESOURCE
+from surepy.entities import SurepyEntity
+from surepy.enums import EntityType, Location
+
+from custom_components.sureha.snapshot import entities_from_raw_data
+
+
+def _signal(rng: random.Random) -> dict[str, float]:
+    """Return a random signal strength."""
+    return {
+        "device_rssi": float(rng.randint(-90, -40)),
+        "hub_rssi": float(rng.randint(-90, -40)),
+    }
+
+
+def synthetic_household(
+    household_id: int,
+    first_id: int,
+    pets: int,
+    flaps: int,
+    feeders: int,
+    felaquas: int,
+    rng: random.Random,
+) -> list[dict[str, Any]]:
+    """Return the raw api data of a household with a hub and its devices."""
+
+    now = datetime.now(timezone.utc)
+    first_pet_id = first_id + 1 + flaps + feeders + felaquas
+    ids = iter(range(first_id, first_pet_id + pets))
+
+    hub_id = next(ids)
+    raw_entities: list[dict[str, Any]] = [
+        {
+            "id": hub_id,
+            "product_id": EntityType.HUB.value,
+            "household_id": household_id,
+            "name": f"hub {household_id}",
+            "serial_number": f"H{hub_id:010}",
+            "status": {
+                "led_mode": 4,
+                "pairing_mode": False,
+                "online": True,
+                "version": {"device": {"firmware": 2.43}},
+            },
+        }
+    ]
+
+    def device(product: EntityType, name: str, **data: Any) -> dict[str, Any]:
+        device_id = next(ids)
+        return {
+            "id": device_id,
+            "product_id": product.value,
+            "household_id": household_id,
+            "parent_device_id": hub_id,
+            "name": f"{name} {device_id}",
+            "mac_address": f"{device_id:012x}",
+            **data,
+        }
+
+    def status(**data: Any) -> dict[str, Any]:
+        return {
+            "battery": round(rng.uniform(5.0, 6.2), 3),
+            "online": True,
+            "signal": _signal(rng),
+            "version": {"device": {"firmware": 1}},
+            **data,
+        }
+
+    raw_entities += [
+        device(
+            EntityType.CAT_FLAP,
+            "flap",
+            control={"curfew": []},
+            # every pet is allowed through every flap
+            tags=[
+                {"id": pet_id, "index": index, "profile": 2}
+                for index, pet_id in enumerate(range(first_pet_id, first_pet_id + pets))
+            ],
+            status=status(locking={"mode": rng.randint(0, 3)}, learn_mode=False),
+        )
+        for _ in range(flaps)
+    ]
+
+    raw_entities += [
+        device(
+            EntityType.FEEDER,
+            "feeder",
+            control={
+                "bowls": {
+                    "settings": [
+                        {"food_type_id": 1, "target": 40},
+                        {"food_type_id": 2, "target": 30},
+                    ],
+                    "type": 4,
+                }
+            },
+            lunch={
+                "weights": [
+                    {"index": index, "weight": round(rng.uniform(5, 40), 1)}
+                    for index in range(2)
+                ]
+            },
+            status=status(),
+        )
+        for _ in range(feeders)
+    ]
+
+    raw_entities += [
+        device(
+            EntityType.FELAQUA,
+            "felaqua",
+            latest_drink={"remaining": round(rng.uniform(100, 450), 1)},
+            status=status(),
+        )
+        for _ in range(felaquas)
+    ]
+
+    for _ in range(pets):
+        pet_id = next(ids)
+        since = (now - timedelta(minutes=rng.randint(1, 600))).isoformat()
+        raw_entities.append(
+            {
+                "id": pet_id,
+                "household_id": household_id,
+                "name": f"pet {pet_id}",
+                "tag_id": pet_id,
+                "tag": {
+                    "id": pet_id,
+                    "tag": f"900.{pet_id:012}",
+                    "supported_product_ids": [3, 6, 8],
+                },
+                "species_id": 1,
+                "breed_id": rng.randint(1, 300),
+                "food_type_id": 1,
+                "gender": rng.choice([0, 1]),
+                "date_of_birth": "2019-05-01T00:00:00+00:00",
+                "comments": "",
+                "photo": {
+                    "id": pet_id,
+                    "location": f"https://example.com/photos/{pet_id}.png",
+                    "uploading_user_id": household_id,
+                    "created_at": "2021-01-01T00:00:00+00:00",
+                    "updated_at": "2021-01-01T00:00:00+00:00",
+                },
+                "position": {"where": rng.choice([1, 2]), "since": since},
+                "status": {"activity": {"where": 1, "since": since}},
+            }
+        )
+
+    return raw_entities
+
+
+class FakeApi:
+    """Synthetic households and their changes between two polls."""
+
+    def __init__(
+        self,
+        households: int = 1,
+        pets: int = 10,
+        flaps: int = 2,
+        feeders: int = 2,
+        felaquas: int = 1,
+        seed: int = 0,
+    ) -> None:
+        """Generate the households."""
+
+        self.rng = random.Random(seed)
+
+        per_household = 1 + pets + flaps + feeders + felaquas
+        self.raw_entities: list[dict[str, Any]] = [
+            raw_entity
+            for household in range(households)
+            for raw_entity in synthetic_household(
+                household + 1,
+                household * per_household + 100,
+                pets,
+                flaps,
+                feeders,
+                felaquas,
+                self.rng,
+            )
+        ]
+
+        self.timeline_id = 1
+        self.requests = 0
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Build the surepy entities of the next poll."""
+
+        # built ahead so the benchmarks do not measure the fake api
+        raw_entities = copy.deepcopy(self.raw_entities)
+        self.entities = entities_from_raw_data(raw_entities)
+
+        pets = EntityType.PET.value
+        self.response = {
+            "data": {
+                "devices": [
+                    raw_entity
+                    for raw_entity in raw_entities
+                    if int(raw_entity.get("product_id", 0)) != pets
+                ],
+                "pets": [
+                    raw_entity
+                    for raw_entity in raw_entities
+                    if int(raw_entity.get("product_id", 0)) == pets
+                ],
+            }
+        }
+
+    def _of_type(self, *entity_types: EntityType) -> list[dict[str, Any]]:
+        """Return the raw data of the entities of some types."""
+
+        values = {entity_type.value for entity_type in entity_types}
+
+        return [
+            raw_entity
+            for raw_entity in self.raw_entities
+            if int(raw_entity.get("product_id", 0)) in values
+        ]
+
+    def tick(self, moves: int) -> None:
+        """Move some pets, let them eat and prepare the next poll."""
+
+        if moves:
+            now = datetime.now(timezone.utc).isoformat()
+
+            for pet in self.rng.sample(self._of_type(EntityType.PET), moves):
+                where = pet["position"]["where"]
+                pet["position"] = {
+                    "where": (
+                        Location.OUTSIDE.value
+                        if where == Location.INSIDE.value
+                        else Location.INSIDE.value
+                    ),
+                    "since": now,
+                }
+
+            for feeder in self._of_type(EntityType.FEEDER)[:moves]:
+                bowl = self.rng.choice(feeder["lunch"]["weights"])
+                bowl["weight"] = max(round(bowl["weight"] - 1.5, 1), 0.0)
+
+            self.timeline_id += 1
+
+        self._prepare()
+
+
+class FakeSac:
+    """Fake api client of surepy."""
+
+    def __init__(self, api: FakeApi) -> None:
+        """Initialize the client."""
+        self.api = api
+        self._auth_token: str | None = "fake-token"
+
+        # latest responses by resource, like surepy keeps them
+        self.resources: dict[str, Any] = {}
+
+    async def get_token(self) -> str:
+        """Return a new token."""
+        self._auth_token = "fake-token"
+        return self._auth_token
+
+    async def set_pet_location(self, pet_id: int, location: Location) -> dict:
+        """Accept a pet location."""
+        self.api.requests += 1
+        return {"data": {"where": location.value}}
+
+    async def _set_lock_state(self, device_id: int) -> dict:
+        """Accept a lock state."""
+        self.api.requests += 1
+        return {"data": {}}
+
+    lock = unlock = lock_in = lock_out = _set_lock_state
+
+
+class FakeSurepy:
+    """Stand-in for ``surepy.Surepy`` serving the households of a fake api."""
+
+    def __init__(self, api: FakeApi, *args: Any, **kwargs: Any) -> None:
+        """Initialize the fake, the credentials are ignored."""
+        self.api = api
+        self.sac = FakeSac(api)
+
+        # like surepy, entities are added and updated but never removed
+        self.entities: dict[int, SurepyEntity] = {}
+
+    async def get_entities(self, refresh: bool = False) -> dict[int, SurepyEntity]:
+        """Return the prepared entities in the same dict on every poll."""
+        self.api.requests += 1
+        self.sac.resources[MESTART_RESOURCE] = self.api.response
+        self.entities.update(self.api.entities)
+        return self.entities
+
+    async def get_household_timeline(
+        self, household_id: int, entries: int = 25
+    ) -> list[dict[str, Any]]:
+        """Return the newest timeline entry."""
+        self.api.requests += 1
+        return [{"id": self.api.timeline_id, "type": 0}]
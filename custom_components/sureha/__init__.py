@@ -1,19 +1,36 @@
 """The surepetcare integration."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Container
+from datetime import datetime, timedelta
+from functools import partial
 import logging
 from random import choice
+from time import monotonic
 from typing import Any
 
-import async_timeout
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers import config_validation as cv
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import homeassistant.util.dt as dt_util
 from surepy import Surepy
 from surepy.entities import SurepyEntity
 from surepy.enums import EntityType, Location, LockState
@@ -21,26 +38,53 @@ from surepy.exceptions import SurePetcareAuthenticationError, SurePetcareError
 import voluptuous as vol
 
 # pylint: disable=import-error
+from .auth import TokenManager
+from .client import CircuitOpenError, ResilientClient
 from .const import (
+    ATTRIBUTE_PROFILE_FULL,
+    ATTR_DAYS,
     ATTR_FLAP_ID,
+    ATTR_HOUSEHOLD_ID,
     ATTR_LOCK_STATE,
     ATTR_PET_ID,
     ATTR_VOLTAGE_FULL,
     ATTR_VOLTAGE_LOW,
     ATTR_WHERE,
+    CONF_ATTRIBUTE_PROFILE,
+    CONF_INCREMENTAL_UPDATES,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_MIN,
     DOMAIN,
+    SERVICE_PET_HISTORY,
     SERVICE_PET_LOCATION,
     SERVICE_SET_LOCK_STATE,
-    SPC,
+    SURE_INDEX,
+    SURE_MAX_PARALLEL_COMMANDS,
     SURE_API_TIMEOUT,
     SURE_BATT_VOLTAGE_FULL,
     SURE_BATT_VOLTAGE_LOW,
+    SURE_CONFIRM_DELAY,
+    SURE_FULL_REFRESH_INTERVAL,
+    SURE_SCAN_INTERVAL,
+    SURE_SCAN_INTERVAL_MAX,
+    SURE_SCAN_INTERVAL_MIN,
 )
+from .classify import EntityIndex
+from .coordinator import SureDataUpdateCoordinator
+from .devices import DeviceInfoCache
+from .battery import BatteryAnalytics
+from .consumption import ConsumptionAnalytics
+from .history import EventHistory, history_path
+from .since import SinceTicker
+from .snapshot import SnapshotStore
+from .timeline import TimelineUpdater
+from .trace import TRACE_API, TRACE_SERVICES, Tracer
+from .views import build_view
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.BINARY_SENSOR, Platform.DEVICE_TRACKER, Platform.SENSOR]
-SCAN_INTERVAL = timedelta(minutes=3)
+SCAN_INTERVAL = timedelta(seconds=SURE_SCAN_INTERVAL)
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -69,6 +113,8 @@ CATS = [
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up."""
 
+    started = monotonic()
+
     hass.data.setdefault(DOMAIN, {})
 
     # set option defaults
@@ -78,6 +124,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             options={
                 ATTR_VOLTAGE_FULL: SURE_BATT_VOLTAGE_FULL,
                 ATTR_VOLTAGE_LOW: SURE_BATT_VOLTAGE_LOW,
+                CONF_ATTRIBUTE_PROFILE: ATTRIBUTE_PROFILE_FULL,
+                CONF_SCAN_INTERVAL_MIN: SURE_SCAN_INTERVAL_MIN,
+                CONF_SCAN_INTERVAL_MAX: SURE_SCAN_INTERVAL_MAX,
+                CONF_INCREMENTAL_UPDATES: False,
             },
         )
 
@@ -103,149 +153,351 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     spc = SurePetcareAPI(hass, entry, surepy)
 
+    spc.tokens = TokenManager(hass, entry, surepy)
+    spc.client = ResilientClient(spc.tokens)
+    spc.snapshot = SnapshotStore(hass, entry.entry_id)
+
+    spc.battery = BatteryAnalytics(
+        hass,
+        entry.entry_id,
+        voltage_full=float(
+            entry.options.get(ATTR_VOLTAGE_FULL, SURE_BATT_VOLTAGE_FULL)
+        ),
+        voltage_low=float(entry.options.get(ATTR_VOLTAGE_LOW, SURE_BATT_VOLTAGE_LOW)),
+    )
+    await spc.battery.async_load()
+
+    spc.updater = TimelineUpdater(
+        surepy,
+        incremental=bool(entry.options.get(CONF_INCREMENTAL_UPDATES, False)),
+        full_refresh_interval=SURE_FULL_REFRESH_INTERVAL,
+    )
+
     async def async_update_data():
 
         try:
             # asyncio.TimeoutError and aiohttp.ClientError already handled
-
-            async with async_timeout.timeout(20):
-                return await spc.surepy.get_entities(refresh=True)
+            surepy_entities = await spc.client.async_call(
+                spc.updater.async_get_entities
+            )
 
         except SurePetcareAuthenticationError as err:
             raise ConfigEntryAuthFailed from err
         except SurePetcareError as err:
+            if spc.client.is_open and spc.coordinator.data:
+                # keep the entities available with the last known data
+                if not isinstance(err, CircuitOpenError):
+                    _LOGGER.debug("🐾 serving cached data: %s", err)
+                spc.coordinator.stale = True
+                return spc.coordinator.data
+
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-    spc.coordinator = DataUpdateCoordinator(
+        spc.coordinator.stale = False
+
+        spc.tracer.trace(
+            TRACE_API,
+            "entities",
+            lambda: {
+                entity_id: surepy_entity.raw_data()
+                for entity_id, surepy_entity in surepy_entities.items()
+            },
+        )
+
+        return surepy_entities
+
+    spc.coordinator = SureDataUpdateCoordinator(
         hass,
         _LOGGER,
         name="sureha_sensors",
         update_method=async_update_data,
-        update_interval=timedelta(seconds=150),
+        update_interval=SCAN_INTERVAL,
+        interval_min=int(
+            entry.options.get(CONF_SCAN_INTERVAL_MIN, SURE_SCAN_INTERVAL_MIN)
+        ),
+        interval_max=int(
+            entry.options.get(CONF_SCAN_INTERVAL_MAX, SURE_SCAN_INTERVAL_MAX)
+        ),
+        view_factory=partial(
+            build_view,
+            attribute_profile=spc.attribute_profile,
+            voltage_full=float(
+                entry.options.get(ATTR_VOLTAGE_FULL, SURE_BATT_VOLTAGE_FULL)
+            ),
+            voltage_low=float(entry.options.get(ATTR_VOLTAGE_LOW, SURE_BATT_VOLTAGE_LOW)),
+        ),
     )
 
-    await spc.coordinator.async_config_entry_first_refresh()
+    if snapshot := await spc.snapshot.async_load():
+        # create the entities from the snapshot and refresh them in the background
+        spc.coordinator.stale = True
+        spc.coordinator.async_set_updated_data(snapshot)
+        entry.async_create_background_task(
+            hass, spc.coordinator.async_refresh(), f"{DOMAIN}_refresh_snapshot"
+        )
+    else:
+        await spc.coordinator.async_config_entry_first_refresh()
+
+    # opened after the first refresh, a failed one would not close it again
+    spc.history = EventHistory(hass, entry.entry_id)
+    await spc.history.async_setup()
+
+    hass.data[DOMAIN][entry.entry_id] = spc
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    entry.async_on_unload(spc.async_cancel_confirm)
+    entry.async_on_unload(spc.coordinator.async_add_listener(spc.async_save_snapshot))
+    spc.async_save_snapshot()
+    entry.async_on_unload(spc.coordinator.async_add_listener(spc.async_record_history))
+    spc.async_record_history()
+    entry.async_on_unload(spc.coordinator.async_add_listener(spc.async_sample_levels))
+    spc.async_sample_levels()
+    entry.async_on_unload(spc.coordinator.async_add_listener(spc.async_update_devices))
+    entry.async_on_unload(
+        spc.coordinator.async_add_listener(spc.async_update_device_info)
+    )
 
-    hass.data[DOMAIN][SPC] = spc
+    setup_ok = await spc.async_setup()
 
-    return await spc.async_setup()
+    _LOGGER.info(
+        "🐾 set up in %.2fs (%s)",
+        monotonic() - started,
+        "from snapshot" if spc.coordinator.stale else "live",
+    )
 
+    return setup_ok
 
-class SurePetcareAPI:
-    """Define a generic Sure Petcare object."""
 
-    def __init__(
-        self, hass: HomeAssistant, config_entry: ConfigEntry, surepy: Surepy
-    ) -> None:
-        """Initialize the Sure Petcare object."""
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
 
-        self.coordinator: DataUpdateCoordinator
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        spc: SurePetcareAPI = hass.data[DOMAIN].pop(entry.entry_id)
+        await spc.history.async_close()
+        await spc.battery.async_save()
 
-        self.hass = hass
-        self.config_entry = config_entry
-        self.surepy = surepy
+        async_update_index(hass)
+        async_register_services(hass)
 
-        self.states: dict[int, Any] = {}
+    return unload_ok
 
-    async def set_pet_location(self, pet_id: int, location: Location) -> None:
-        """Update the lock state of a flap."""
 
-        await self.surepy.sac.set_pet_location(pet_id, location)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the snapshot, history and battery states of a removed config entry."""
 
-    async def set_lock_state(self, flap_id: int, state: str) -> None:
-        """Update the lock state of a flap."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+    await BatteryAnalytics(hass, entry.entry_id).async_remove()
+    await hass.async_add_executor_job(history_path(hass, entry.entry_id).unlink, True)
 
-        # https://github.com/PyCQA/pylint/issues/2062
-        # pylint: disable=no-member
-        lock_states = {
-            LockState.UNLOCKED.name.lower(): self.surepy.sac.unlock,
-            LockState.LOCKED_IN.name.lower(): self.surepy.sac.lock_in,
-            LockState.LOCKED_OUT.name.lower(): self.surepy.sac.lock_out,
-            LockState.LOCKED_ALL.name.lower(): self.surepy.sac.lock,
-        }
 
-        # elegant functions dict to choose the right function | idea by @janiversen
-        await lock_states[state.lower()](flap_id)
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when the options have changed."""
 
-    async def async_setup(self) -> bool:
-        """Set up the Sure Petcare integration."""
+    # the entry is also updated when the token manager stores a new token
+    if (spc := hass.data[DOMAIN].get(entry.entry_id)) and spc.options == entry.options:
+        return
 
-        _LOGGER.info("")
-        _LOGGER.info(
-            "%s %s", " \x1b[38;2;255;26;102m·\x1b[0m" * 24, choice(CATS)  # nosec
-        )
-        _LOGGER.info("  🐾   meeowww..! to the SureHA integration!")
-        _LOGGER.info("  🐾     code & issues: https://github.com/benleb/sureha")
-        _LOGGER.info(" \x1b[38;2;255;26;102m·\x1b[0m" * 30)
-        _LOGGER.info("")
+    await hass.config_entries.async_reload(entry.entry_id)
 
-        await self.hass.config_entries.async_forward_entry_setups(self.config_entry, PLATFORMS)
 
-        surepy_entities: list[SurepyEntity] = self.coordinator.data.values()
+@callback
+def async_update_index(hass: HomeAssistant) -> None:
+    """Map the id of every pet and device to the config entry it belongs to."""
 
-        pet_ids = [
-            entity.id for entity in surepy_entities if entity.type == EntityType.PET
-        ]
+    hass.data[SURE_INDEX] = {
+        surepy_id: entry_id
+        for entry_id, spc in hass.data[DOMAIN].items()
+        for surepy_id in spc.coordinator.data
+    }
 
-        pet_location_service_schema = vol.Schema(
-            {
-                vol.Required(ATTR_PET_ID): vol.Any(cv.positive_int, vol.In(pet_ids)),
-                vol.Required(ATTR_WHERE): vol.Any(
-                    cv.string,
-                    vol.In(
-                        [
-                            # https://github.com/PyCQA/pylint/issues/2062
-                            # pylint: disable=no-member
-                            Location.INSIDE.name.title(),
-                            Location.OUTSIDE.name.title(),
-                        ]
-                    ),
+
+@callback
+def async_get_spc(hass: HomeAssistant, surepy_id: int) -> SurePetcareAPI | None:
+    """Return the Sure Petcare object a pet or device belongs to."""
+
+    if (entry_id := hass.data.get(SURE_INDEX, {}).get(surepy_id)) is None:
+        return None
+
+    return hass.data[DOMAIN].get(entry_id)
+
+
+@callback
+def async_remove_entity(entity: Entity) -> None:
+    """Remove an entity of a pet or device removed from the account."""
+
+    entity_registry = er.async_get(entity.hass)
+
+    # removing the registry entry removes the entity as well
+    if entity_registry.async_get(entity.entity_id):
+        entity_registry.async_remove(entity.entity_id)
+    else:
+        # not registered, like the trackers without a mac address, or already
+        # removed from the registry with its device
+        entity.hass.async_create_task(entity.async_remove(force_remove=True))
+
+
+def known_id(ids: Callable[[], Container[int]], kind: str) -> Callable[[Any], Any]:
+    """Return a validator accepting the ids currently known, not at registration."""
+
+    def validate(value: Any) -> Any:
+        if value not in ids():
+            raise vol.Invalid(f"unknown {kind} id {value}")
+        return value
+
+    return validate
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the services for the pets and flaps of all accounts."""
+
+    if not hass.data[DOMAIN]:
+        hass.services.async_remove(DOMAIN, SERVICE_PET_LOCATION)
+        hass.services.async_remove(DOMAIN, SERVICE_PET_HISTORY)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_LOCK_STATE)
+        return
+
+    # the ids are validated against the live indexes, once is enough
+    if hass.services.has_service(DOMAIN, SERVICE_SET_LOCK_STATE):
+        return
+
+    def indexes() -> list[EntityIndex]:
+        return [spc.coordinator.index for spc in hass.data[DOMAIN].values()]
+
+    def pet_ids() -> set[int]:
+        return {pet_id for index in indexes() for pet_id in index.pets}
+
+    def flap_ids() -> set[int]:
+        return {flap_id for index in indexes() for flap_id in index.flaps}
+
+    def flap_ids_by_household() -> dict[int, list[int]]:
+        flap_ids_of: dict[int, list[int]] = {}
+        for index in indexes():
+            for household_id, household_flap_ids in index.flaps_by_household.items():
+                flap_ids_of.setdefault(household_id, []).extend(household_flap_ids)
+        return flap_ids_of
+
+    pet_location_service_schema = vol.Schema(
+        {
+            vol.Required(ATTR_PET_ID): vol.All(
+                cv.positive_int, known_id(pet_ids, "pet")
+            ),
+            vol.Required(ATTR_WHERE): vol.Any(
+                cv.string,
+                vol.In(
+                    [
+                        # https://github.com/PyCQA/pylint/issues/2062
+                        # pylint: disable=no-member
+                        Location.INSIDE.name.title(),
+                        Location.OUTSIDE.name.title(),
+                    ]
                 ),
-            }
-        )
+            ),
+        }
+    )
 
-        async def handle_set_pet_location(call: Any) -> None:
-            """Call when setting the lock state."""
+    async def handle_set_pet_location(call: ServiceCall) -> None:
+        """Call when setting the lock state."""
 
-            try:
+        try:
 
-                if (pet_id := int(call.data.get(ATTR_PET_ID))) and (
-                    where := str(call.data.get(ATTR_WHERE))
-                ):
+            if (pet_id := int(call.data.get(ATTR_PET_ID))) and (
+                where := str(call.data.get(ATTR_WHERE))
+            ):
 
-                    await self.set_pet_location(pet_id, Location[where.upper()])
-                    await self.coordinator.async_request_refresh()
+                if not (spc := async_get_spc(hass, pet_id)):
+                    raise ValueError(f"unknown pet id {pet_id}")
 
-            except ValueError as error:
-                _LOGGER.error(
-                    "🐾 \x1b[38;2;255;26;102m·\x1b[0m arguments of wrong type: %s", error
-                )
+                await spc.set_pet_location(pet_id, Location[where.upper()])
 
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_PET_LOCATION,
-            handle_set_pet_location,
-            schema=pet_location_service_schema,
-        )
+        except ValueError as error:
+            _LOGGER.error(
+                "🐾 \x1b[38;2;255;26;102m·\x1b[0m arguments of wrong type: %s", error
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PET_LOCATION,
+        handle_set_pet_location,
+        schema=pet_location_service_schema,
+    )
 
-        async def handle_set_lock_state(call: Any) -> None:
-            """Call when setting the lock state."""
+    async def handle_get_pet_history(call: ServiceCall) -> ServiceResponse:
+        """Call when querying the daily aggregates of a pet."""
 
-            flap_id = call.data.get(ATTR_FLAP_ID)
-            lock_state = call.data.get(ATTR_LOCK_STATE)
+        pet_id = int(call.data[ATTR_PET_ID])
 
-            await self.set_lock_state(flap_id, lock_state)
-            await self.coordinator.async_request_refresh()
+        if not (spc := async_get_spc(hass, pet_id)):
+            raise HomeAssistantError(f"unknown pet id {pet_id}")
 
-        flap_ids = [
-            entity.id
-            for entity in surepy_entities
-            if entity.type in [EntityType.CAT_FLAP, EntityType.PET_FLAP]
-        ]
+        return {
+            "pet_id": pet_id,
+            "days": await spc.history.async_days(pet_id, call.data[ATTR_DAYS]),
+        }
 
-        lock_state_service_schema = vol.Schema(
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PET_HISTORY,
+        handle_get_pet_history,
+        schema=vol.Schema(
             {
-                vol.Required(ATTR_FLAP_ID): vol.All(cv.positive_int, vol.In(flap_ids)),
+                vol.Required(ATTR_PET_ID): vol.All(
+                    vol.Coerce(int), known_id(pet_ids, "pet")
+                ),
+                vol.Optional(ATTR_DAYS, default=7): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=365)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def handle_set_lock_state(call: ServiceCall) -> None:
+        """Call when setting the lock state of one or more flaps."""
+
+        lock_state = call.data.get(ATTR_LOCK_STATE)
+
+        flap_ids: list[int] = call.data.get(ATTR_FLAP_ID) or (
+            flap_ids_by_household().get(call.data.get(ATTR_HOUSEHOLD_ID), [])
+        )
+
+        # the schema only accepts flap ids of loaded config entries
+        flap_ids_by_spc: dict[SurePetcareAPI, list[int]] = {}
+        for flap_id in flap_ids:
+            flap_ids_by_spc.setdefault(async_get_spc(hass, flap_id), []).append(flap_id)
+
+        errors: dict[int, Exception] = {}
+        for spc_errors in await asyncio.gather(
+            *(
+                spc.set_lock_states(spc_flap_ids, lock_state)
+                for spc, spc_flap_ids in flap_ids_by_spc.items()
+            )
+        ):
+            errors.update(spc_errors)
+
+        for flap_id, error in errors.items():
+            _LOGGER.error(
+                "🐾 \x1b[38;2;255;26;102m·\x1b[0m setting lock state of %s failed: %s",
+                flap_id,
+                error,
+            )
+
+        if errors:
+            raise HomeAssistantError(
+                f"Setting the lock state failed for {len(errors)} of {len(flap_ids)} "
+                f"flaps: {', '.join(str(flap_id) for flap_id in errors)}"
+            )
+
+    lock_state_service_schema = vol.All(
+        vol.Schema(
+            {
+                vol.Exclusive(ATTR_FLAP_ID, "flaps"): vol.All(
+                    cv.ensure_list_csv,
+                    [vol.All(cv.positive_int, known_id(flap_ids, "flap"))],
+                ),
+                vol.Exclusive(ATTR_HOUSEHOLD_ID, "flaps"): vol.All(
+                    cv.positive_int, known_id(flap_ids_by_household, "household")
+                ),
                 vol.Required(ATTR_LOCK_STATE): vol.All(
                     cv.string,
                     vol.Lower,
@@ -261,13 +513,317 @@ class SurePetcareAPI:
                     ),
                 ),
             }
+        ),
+        cv.has_at_least_one_key(ATTR_FLAP_ID, ATTR_HOUSEHOLD_ID),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_LOCK_STATE,
+        handle_set_lock_state,
+        schema=lock_state_service_schema,
+    )
+
+
+class SurePetcareAPI:
+    """Define a generic Sure Petcare object."""
+
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, surepy: Surepy
+    ) -> None:
+        """Initialize the Sure Petcare object."""
+
+        self.coordinator: SureDataUpdateCoordinator
+        self.tokens: TokenManager
+        self.client: ResilientClient
+        self.updater: TimelineUpdater
+        self.snapshot: SnapshotStore
+        self.history: EventHistory
+        self.battery: BatteryAnalytics
+
+        self.hass = hass
+        self.config_entry = config_entry
+        self.surepy = surepy
+
+        # options the entry was set up with
+        self.options = dict(config_entry.options)
+
+        self.states: dict[int, Any] = {}
+
+        # updates the time since the last location change of all pets
+        self.since_ticker = SinceTicker(hass)
+
+        # consumption of the feeder bowls and felaquas, sampled on every update
+        self.consumption = ConsumptionAnalytics()
+
+        # device registry records, shared by the entities of a pet or device
+        self.devices = DeviceInfoCache(hass)
+
+        self.tracer = Tracer()
+
+        # optimistically applied lock states and pet locations, by surepy id
+        self.pending: dict[int, int] = {}
+
+        # a single confirmation refresh covers a burst of commands, it is
+        # postponed by every command
+        self._unsub_confirm: CALLBACK_TYPE | None = None
+
+    @property
+    def attribute_profile(self) -> str:
+        """Return the configured state attribute profile."""
+        return str(
+            self.config_entry.options.get(
+                CONF_ATTRIBUTE_PROFILE, ATTRIBUTE_PROFILE_FULL
+            )
         )
 
-        self.hass.services.async_register(
-            DOMAIN,
-            SERVICE_SET_LOCK_STATE,
-            handle_set_lock_state,
-            schema=lock_state_service_schema,
+    @callback
+    def async_save_snapshot(self) -> None:
+        """Persist the coordinator data if it changed."""
+
+        if (
+            self.coordinator.last_update_success
+            and self.coordinator.changed_ids
+            and not self.coordinator.stale
+            and not self.pending
+        ):
+            self.snapshot.async_save(self.coordinator.data)
+
+    @callback
+    def async_record_history(self) -> None:
+        """Record the latest events of the changed pets."""
+
+        self.history.async_record(
+            surepy_entity
+            for surepy_id in self.coordinator.changed_ids
+            if (surepy_entity := self.coordinator.data.get(surepy_id))
+            and surepy_entity.type == EntityType.PET
+            # optimistic locations are recorded once they are confirmed
+            and surepy_id not in self.pending
         )
 
-        return True
\ No newline at end of file
+    @callback
+    def async_sample_levels(self) -> None:
+        """Sample the food, water and battery levels of the devices."""
+
+        # a snapshot or cached data is not a new sample
+        if not self.coordinator.stale:
+            self.consumption.async_sample(self.coordinator.views.values())
+            self.battery.async_sample(self.coordinator.views.values())
+
+    @callback
+    def async_update_devices(self) -> None:
+        """Follow the pets and devices paired to or removed from the account."""
+
+        added_ids = self.coordinator.added_ids
+        removed_ids = self.coordinator.removed_ids
+
+        if not added_ids and not removed_ids:
+            return
+
+        # the entities add or remove themselves, their devices are removed here
+        device_registry = dr.async_get(self.hass)
+
+        for device_id in self.devices.async_forget(removed_ids):
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, device_id)}
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.config_entry.entry_id
+                )
+
+        self.consumption.async_forget(removed_ids)
+        self.battery.async_forget(removed_ids)
+
+        async_update_index(self.hass)
+
+        _LOGGER.info(
+            "🐾 %d pets/devices added, %d removed", len(added_ids), len(removed_ids)
+        )
+
+    @callback
+    def async_update_device_info(self) -> None:
+        """Rebuild the device registry records of the changed pets and devices."""
+
+        self.devices.async_update(
+            surepy_entity
+            for surepy_id in self.coordinator.changed_ids
+            if (surepy_entity := self.coordinator.data.get(surepy_id))
+        )
+
+    @staticmethod
+    def _confirmed_value(surepy_entity: SurepyEntity) -> int | None:
+        """Return the lock mode of a flap or the location of a pet."""
+
+        raw_data = surepy_entity.raw_data()
+
+        if surepy_entity.type == EntityType.PET:
+            return raw_data.get("position", {}).get("where")
+
+        return raw_data.get("status", {}).get("locking", {}).get("mode")
+
+    @callback
+    def _async_apply_optimistic(self, values: dict[int, int]) -> None:
+        """Show sent commands with a single update and confirm them later."""
+
+        applied = False
+
+        for surepy_id, value in values.items():
+
+            if not (surepy_entity := self.coordinator.data.get(surepy_id)):
+                continue
+
+            raw_data = surepy_entity.raw_data()
+
+            if surepy_entity.type == EntityType.PET:
+                raw_data["position"] = {
+                    **raw_data.get("position", {}),
+                    "where": value,
+                    "since": dt_util.utcnow().isoformat(),
+                }
+            else:
+                status = raw_data.setdefault("status", {})
+                status["locking"] = {**status.get("locking", {}), "mode": value}
+
+            self.pending[surepy_id] = value
+            applied = True
+
+        if applied:
+            self.coordinator.async_set_updated_data(self.coordinator.data)
+
+        self.coordinator.async_boost()
+        self.updater.request_full_refresh()
+        self._async_schedule_confirm()
+
+    @callback
+    def _async_schedule_confirm(self) -> None:
+        """Confirm the pending commands ``SURE_CONFIRM_DELAY`` after the last one."""
+
+        self.async_cancel_confirm()
+        self._unsub_confirm = async_call_later(
+            self.hass, SURE_CONFIRM_DELAY, self._async_confirm_later
+        )
+
+    @callback
+    def _async_confirm_later(self, _now: datetime) -> None:
+        """Start the confirmation refresh."""
+        self._unsub_confirm = None
+        self.hass.async_create_task(self._async_confirm())
+
+    @callback
+    def async_cancel_confirm(self) -> None:
+        """Cancel a scheduled confirmation refresh."""
+
+        if self._unsub_confirm:
+            self._unsub_confirm()
+            self._unsub_confirm = None
+
+    async def _async_confirm(self) -> None:
+        """Fetch the real states of all optimistically updated entities."""
+
+        pending, self.pending = self.pending, {}
+
+        await self.coordinator.async_request_refresh()
+
+        if not self.coordinator.last_update_success:
+            # the cached entities will be replaced by the next successful update
+            self.updater.request_full_refresh()
+            return
+
+        for surepy_id, value in pending.items():
+            if (surepy_entity := self.coordinator.data.get(surepy_id)) and (
+                confirmed := self._confirmed_value(surepy_entity)
+            ) != value:
+                _LOGGER.warning(
+                    "🐾 \x1b[38;2;255;26;102m·\x1b[0m %s is %s instead of %s, rolled back",
+                    surepy_entity.name,
+                    confirmed,
+                    value,
+                )
+
+    async def set_pet_location(self, pet_id: int, location: Location) -> None:
+        """Update the location of a pet."""
+
+        self.tracer.trace(
+            TRACE_SERVICES, "set pet location", {"pet_id": pet_id, "where": location}
+        )
+
+        await self.client.async_call(self.surepy.sac.set_pet_location, pet_id, location)
+
+        self._async_apply_optimistic({pet_id: int(location.value)})
+
+    async def _async_send_lock_state(self, flap_id: int, state: str) -> int:
+        """Send the lock state of a flap, return the lock mode to show."""
+
+        # https://github.com/PyCQA/pylint/issues/2062
+        # pylint: disable=no-member
+        lock_states = {
+            LockState.UNLOCKED.name.lower(): self.surepy.sac.unlock,
+            LockState.LOCKED_IN.name.lower(): self.surepy.sac.lock_in,
+            LockState.LOCKED_OUT.name.lower(): self.surepy.sac.lock_out,
+            LockState.LOCKED_ALL.name.lower(): self.surepy.sac.lock,
+        }
+
+        self.tracer.trace(
+            TRACE_SERVICES, "set lock state", {"flap_id": flap_id, "state": state}
+        )
+
+        # elegant functions dict to choose the right function | idea by @janiversen
+        await self.client.async_call(lock_states[state.lower()], flap_id)
+
+        return int(LockState[state.upper()].value)
+
+    async def set_lock_state(self, flap_id: int, state: str) -> None:
+        """Update the lock state of a flap."""
+
+        self._async_apply_optimistic(
+            {flap_id: await self._async_send_lock_state(flap_id, state)}
+        )
+
+    async def set_lock_states(
+        self, flap_ids: list[int], state: str
+    ) -> dict[int, Exception]:
+        """Update the lock state of several flaps, return the errors by flap id."""
+
+        semaphore = asyncio.Semaphore(SURE_MAX_PARALLEL_COMMANDS)
+
+        async def set_lock_state(flap_id: int) -> int:
+            async with semaphore:
+                return await self._async_send_lock_state(flap_id, state)
+
+        results = await asyncio.gather(
+            *(set_lock_state(flap_id) for flap_id in flap_ids), return_exceptions=True
+        )
+
+        # the sent lock states of all flaps are shown with a single update
+        if sent := {
+            flap_id: result
+            for flap_id, result in zip(flap_ids, results)
+            if not isinstance(result, BaseException)
+        }:
+            self._async_apply_optimistic(sent)
+
+        return {
+            flap_id: result
+            for flap_id, result in zip(flap_ids, results)
+            if isinstance(result, Exception)
+        }
+
+    async def async_setup(self) -> bool:
+        """Set up the Sure Petcare integration."""
+
+        _LOGGER.info("")
+        _LOGGER.info(
+            "%s %s", " \x1b[38;2;255;26;102m·\x1b[0m" * 24, choice(CATS)  # nosec
+        )
+        _LOGGER.info("  🐾   meeowww..! to the SureHA integration!")
+        _LOGGER.info("  🐾     code & issues: https://github.com/benleb/sureha")
+        _LOGGER.info(" \x1b[38;2;255;26;102m·\x1b[0m" * 30)
+        _LOGGER.info("")
+
+        await self.hass.config_entries.async_forward_entry_setups(self.config_entry, PLATFORMS)
+
+        async_update_index(self.hass)
+        async_register_services(self.hass)
+
+        return True
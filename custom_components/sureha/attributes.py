@@ -0,0 +1,135 @@
+"""State attribute profiles for Sure Petcare entities."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from surepy.entities import SurepyEntity
+from surepy.enums import EntityType
+
+# pylint: disable=relative-beyond-top-level
+from .const import ATTRIBUTE_PROFILE_CURATED, ATTRIBUTE_PROFILE_FULL
+
+
+def _device_attributes(device: SurepyEntity) -> dict[str, Any]:
+    """Return the curated attributes shared by all devices."""
+
+    raw_data = device.raw_data()
+    status = raw_data.get("status", {})
+
+    return {
+        "id": int(device.id),
+        "household_id": int(device.household_id),
+        "parent_device_id": (
+            int(parent_id) if (parent_id := raw_data.get("parent_device_id")) else None
+        ),
+        "serial_number": (
+            str(serial) if (serial := raw_data.get("serial_number")) else None
+        ),
+        "online": bool(status.get("online")),
+    }
+
+
+def _flap_attributes(flap: SurepyEntity) -> dict[str, Any]:
+    """Return the curated attributes of a flap."""
+
+    curfews = flap.raw_data().get("control", {}).get("curfew") or []
+
+    if isinstance(curfews, dict):
+        curfews = [curfews]
+
+    return {
+        **_device_attributes(flap),
+        "curfew": [
+            {
+                "enabled": bool(curfew.get("enabled")),
+                "lock_time": str(curfew.get("lock_time", "")),
+                "unlock_time": str(curfew.get("unlock_time", "")),
+            }
+            for curfew in curfews
+        ],
+    }
+
+
+def _feeder_attributes(feeder: SurepyEntity) -> dict[str, Any]:
+    """Return the curated attributes of a feeder."""
+
+    bowls = feeder.raw_data().get("control", {}).get("bowls", {})
+
+    return {
+        **_device_attributes(feeder),
+        "bowls": [
+            {
+                "food_type_id": int(bowl.get("food_type_id", 0)),
+                "target": int(bowl.get("target", 0)),
+            }
+            for bowl in bowls.get("settings", [])
+        ],
+    }
+
+
+def _felaqua_attributes(felaqua: SurepyEntity) -> dict[str, Any]:
+    """Return the curated attributes of a felaqua."""
+
+    latest_drink = felaqua.raw_data().get("latest_drink", {})
+
+    return {
+        **_device_attributes(felaqua),
+        "water_change": (
+            float(change) if (change := latest_drink.get("change")) is not None else None
+        ),
+        "water_updated_at": (
+            str(updated_at) if (updated_at := latest_drink.get("date")) else None
+        ),
+    }
+
+
+def _pet_attributes(pet: SurepyEntity) -> dict[str, Any]:
+    """Return the curated attributes of a pet."""
+
+    raw_data = pet.raw_data()
+    status = raw_data.get("status", {})
+
+    return {
+        "id": int(pet.id),
+        "household_id": int(pet.household_id),
+        "tag_id": int(tag_id) if (tag_id := raw_data.get("tag_id")) else None,
+        "activity_where": (
+            int(where)
+            if (where := status.get("activity", {}).get("where")) is not None
+            else None
+        ),
+        "activity_since": (
+            str(since) if (since := status.get("activity", {}).get("since")) else None
+        ),
+        "last_feeding": (
+            str(fed_at) if (fed_at := status.get("feeding", {}).get("at")) else None
+        ),
+        "last_drinking": (
+            str(drank_at) if (drank_at := status.get("drinking", {}).get("at")) else None
+        ),
+    }
+
+
+CURATED_ATTRIBUTES: dict[EntityType, Callable[[SurepyEntity], dict[str, Any]]] = {
+    EntityType.PET: _pet_attributes,
+    EntityType.HUB: _device_attributes,
+    EntityType.CAT_FLAP: _flap_attributes,
+    EntityType.PET_FLAP: _flap_attributes,
+    EntityType.FEEDER: _feeder_attributes,
+    EntityType.FELAQUA: _felaqua_attributes,
+}
+
+
+def profile_attributes(profile: str, surepy_entity: SurepyEntity) -> dict[str, Any]:
+    """Return the state attributes of an entity for the given attribute profile."""
+
+    if profile == ATTRIBUTE_PROFILE_FULL:
+        return {**surepy_entity.raw_data()}
+
+    if profile == ATTRIBUTE_PROFILE_CURATED:
+        return CURATED_ATTRIBUTES.get(surepy_entity.type, _device_attributes)(
+            surepy_entity
+        )
+
+    return {}
@@ -0,0 +1,130 @@
+"""Token lifecycle of the Sure Petcare api."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+from time import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant, callback
+from surepy import Surepy
+from surepy.exceptions import SurePetcareAuthenticationError, SurePetcareError
+
+# pylint: disable=relative-beyond-top-level
+from .const import SURE_TOKEN_REFRESH_MARGIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+def token_expiry(token: str | None) -> float | None:
+    """Return the expiry timestamp of a jwt token, if it has one."""
+
+    try:
+        payload = str(token).split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """Keep the api token of a config entry valid.
+
+    The token is renewed with the stored credentials shortly before it
+    expires, or once after a call failed with an authentication error, and
+    every new token is written back to the config entry. Concurrent calls
+    share a lock, so a burst of calls with an expired token only logs in once.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, surepy: Surepy
+    ) -> None:
+        """Initialize the token manager."""
+
+        self.hass = hass
+        self.config_entry = config_entry
+        self.surepy = surepy
+
+        self._lock = asyncio.Lock()
+
+        # number of logins since the config entry was set up
+        self.logins: int = 0
+
+    @property
+    def token(self) -> str | None:
+        """Return the token currently used by surepy."""
+        # pylint: disable=protected-access
+        return self.surepy.sac._auth_token
+
+    @property
+    def expires(self) -> float | None:
+        """Return the expiry timestamp of the current token."""
+        return token_expiry(self.token)
+
+    def _needs_refresh(self) -> bool:
+        """Return True if there is no token or it is about to expire."""
+
+        if not self.token:
+            return True
+
+        return (
+            expires := self.expires
+        ) is not None and expires - time() < SURE_TOKEN_REFRESH_MARGIN
+
+    async def _async_login(self, old_token: str | None) -> None:
+        """Log in again, unless another call already replaced ``old_token``."""
+
+        async with self._lock:
+
+            if self.token and self.token != old_token:
+                # surepy or a concurrent call already logged in
+                self._async_persist()
+                return
+
+            if not (token := await self.surepy.sac.get_token()):
+                raise SurePetcareError("login did not return a token")
+
+            self.logins += 1
+            _LOGGER.debug("🐾 got a new token, valid until %s", token_expiry(token))
+
+            self._async_persist()
+
+    @callback
+    def _async_persist(self) -> None:
+        """Store the current token in the config entry."""
+
+        if self.token and self.token != self.config_entry.data.get(CONF_TOKEN):
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, CONF_TOKEN: self.token},
+            )
+
+    async def async_call(
+        self, method: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+    ) -> _T:
+        """Call an api method with a valid token.
+
+        An authentication error is only raised if the call still fails after
+        logging in again, which means the stored credentials are wrong.
+        """
+
+        if self._needs_refresh():
+            await self._async_login(self.token)
+
+        token = self.token
+
+        try:
+            return await method(*args, **kwargs)
+        except SurePetcareAuthenticationError:
+            _LOGGER.debug("🐾 token was rejected, logging in again")
+
+        await self._async_login(token)
+
+        return await method(*args, **kwargs)
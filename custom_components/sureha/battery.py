@@ -0,0 +1,190 @@
+"""Smoothed battery levels and depletion forecasts of the devices."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+import logging
+from math import exp
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+# pylint: disable=relative-beyond-top-level
+from .const import (
+    DOMAIN,
+    SURE_BATT_COUNT,
+    SURE_BATT_HYSTERESIS,
+    SURE_BATT_MIN_SPAN,
+    SURE_BATT_REPLACED,
+    SURE_BATT_SLOPE_SMOOTHING,
+    SURE_BATT_SMOOTHING,
+    SURE_BATT_VOLTAGE_FULL,
+    SURE_BATT_VOLTAGE_LOW,
+)
+from .views import EntityView
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# seconds to wait before writing the changed battery states
+SAVE_DELAY = 300
+
+
+def battery_level(voltage: float, voltage_full: float, voltage_low: float) -> int:
+    """Return the level in percent of the total voltage of the batteries."""
+
+    per_battery = voltage / SURE_BATT_COUNT
+
+    level = int((per_battery - voltage_low) / (voltage_full - voltage_low) * 100)
+
+    return max(min(level, 100), 0)
+
+
+@dataclass(slots=True)
+class BatteryState:
+    """Smoothed voltage and discharge slope of the batteries of a device."""
+
+    # exponentially smoothed voltage (V)
+    voltage: float
+    # smoothed discharge slope (V per day), negative while discharging
+    slope: float
+    # timestamps of the last sample and the first sample of these batteries
+    updated: float
+    since: float
+    # level shown, only changes by at least SURE_BATT_HYSTERESIS
+    level: int
+
+
+class BatteryAnalytics:
+    """Battery states of all devices of a config entry.
+
+    Every voltage reading moves an exponential moving average, weighted by
+    the time since the previous reading, so single noisy readings hardly
+    change the level. The change of the average is smoothed again into a
+    discharge slope, which forecasts the days until the batteries reach the
+    low voltage. A device needs a fixed handful of numbers, persisted in a
+    store so the forecast survives restarts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        voltage_full: float = SURE_BATT_VOLTAGE_FULL,
+        voltage_low: float = SURE_BATT_VOLTAGE_LOW,
+    ) -> None:
+        """Initialize the battery analytics."""
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.battery", private=True
+        )
+        self.voltage_full = voltage_full
+        self.voltage_low = voltage_low
+
+        self.states: dict[int, BatteryState] = {}
+
+    async def async_load(self) -> None:
+        """Load the persisted battery states."""
+
+        data = await self._store.async_load() or {}
+
+        try:
+            self.states = {
+                int(device_id): BatteryState(**state)
+                for device_id, state in data.get("devices", {}).items()
+            }
+        except (TypeError, ValueError) as error:
+            _LOGGER.warning("🐾 ignoring invalid battery states: %s", error)
+
+    async def async_save(self) -> None:
+        """Write the battery states now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the persisted battery states."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the battery states to persist."""
+        return {
+            "devices": {
+                str(device_id): asdict(state)
+                for device_id, state in self.states.items()
+            }
+        }
+
+    def _level(self, voltage: float) -> int:
+        """Return the level in percent of a voltage."""
+        return battery_level(voltage, self.voltage_full, self.voltage_low)
+
+    def _sample(self, device_id: int, voltage: float, timestamp: float) -> None:
+        """Add a voltage reading of a device."""
+
+        state = self.states.get(device_id)
+
+        if state is None or voltage - state.voltage >= SURE_BATT_REPLACED:
+            if state is not None:
+                _LOGGER.debug("🐾 batteries of %s were replaced", device_id)
+            self.states[device_id] = BatteryState(
+                voltage, 0.0, timestamp, timestamp, self._level(voltage)
+            )
+            return
+
+        if (elapsed := timestamp - state.updated) <= 0:
+            return
+
+        # weights of the new reading, the longer ago the previous one the more
+        voltage_weight = 1 - exp(-elapsed / SURE_BATT_SMOOTHING)
+        slope_weight = 1 - exp(-elapsed / SURE_BATT_SLOPE_SMOOTHING)
+
+        previous = state.voltage
+        state.voltage += (voltage - previous) * voltage_weight
+        slope = (state.voltage - previous) / elapsed * 86400
+        state.slope += (slope - state.slope) * slope_weight
+        state.updated = timestamp
+
+        level = self._level(state.voltage)
+        if abs(level - state.level) >= SURE_BATT_HYSTERESIS:
+            state.level = level
+
+    @callback
+    def async_sample(self, views: Iterable[EntityView]) -> None:
+        """Add the voltages of some view models."""
+
+        timestamp = dt_util.utcnow().timestamp()
+
+        for view in views:
+            if view.voltage:
+                self._sample(view.id, view.voltage, timestamp)
+
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_forget(self, device_ids: Iterable[int]) -> None:
+        """Drop the states of devices removed from the account."""
+
+        for device_id in device_ids:
+            self.states.pop(device_id, None)
+
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def level(self, device_id: int) -> int | None:
+        """Return the smoothed level of a device."""
+        return state.level if (state := self.states.get(device_id)) else None
+
+    def days_remaining(self, device_id: int) -> float | None:
+        """Return the forecast days until the batteries of a device are low."""
+
+        if (
+            not (state := self.states.get(device_id))
+            or state.updated - state.since < SURE_BATT_MIN_SPAN
+            or state.slope >= 0
+        ):
+            return None
+
+        remaining = state.voltage - self.voltage_low * SURE_BATT_COUNT
+
+        return max(remaining, 0.0) / -state.slope
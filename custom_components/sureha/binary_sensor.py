@@ -1,7 +1,6 @@
 """Support for Sure PetCare Flaps/Pets binary sensors."""
 from __future__ import annotations
 
-from datetime import datetime, timezone, timedelta
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -9,16 +8,18 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from surepy.entities import SurepyEntity
-from surepy.entities.devices import Hub as SureHub, SurepyDevice
 from surepy.entities.pet import Pet as SurePet
-from surepy.enums import EntityType, Location
 
 # pylint: disable=relative-beyond-top-level
-from . import SurePetcareAPI
-from .const import DOMAIN, SPC, SURE_MANUFACTURER
+from . import SurePetcareAPI, async_remove_entity
+from .classify import EntityIndex
+from .const import DOMAIN
+from .since import duration_since, format_duration
+from .views import EntityView
 
 PARALLEL_UPDATES = 2
 
@@ -38,28 +39,36 @@ async def async_setup_entry(
 ) -> None:
     """Set up config entry Sure PetCare Flaps sensors."""
 
-    entities: list[SurePetcareBinarySensor] = []
+    spc: SurePetcareAPI = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities(device_binary_sensors(spc, spc.coordinator.index))
+
+    @callback
+    def async_add_paired() -> None:
+        """Add the binary sensors of pets and devices paired to the account."""
+        if spc.coordinator.added_ids:
+            async_add_entities(device_binary_sensors(spc, spc.coordinator.added))
 
-    spc: SurePetcareAPI = hass.data[DOMAIN][SPC]
+    config_entry.async_on_unload(spc.coordinator.async_add_listener(async_add_paired))
 
-    for surepy_entity in spc.coordinator.data.values():
 
-        if surepy_entity.type == EntityType.PET:
-            entities.append(Pet(spc.coordinator, surepy_entity.id, spc))
+def device_binary_sensors(
+    spc: SurePetcareAPI, index: EntityIndex
+) -> list[SurePetcareBinarySensor]:
+    """Return the binary sensors of the pets and devices of an index."""
 
-        elif surepy_entity.type == EntityType.HUB and surepy_entity.raw_data().get("status", {}).get("led_mode", {}):
-            entities.append(Hub(spc.coordinator, surepy_entity.id, spc))
+    entities: list[SurePetcareBinarySensor] = []
+
+    entities.extend(Pet(spc.coordinator, pet_id, spc) for pet_id in index.pets)
+    entities.extend(Hub(spc.coordinator, hub_id, spc) for hub_id in index.hubs)
 
-        # connectivity
-        elif surepy_entity.type in [
-            EntityType.CAT_FLAP,
-            EntityType.PET_FLAP,
-            EntityType.FEEDER,
-            EntityType.FELAQUA,
-        ]:
-            entities.append(DeviceConnectivity(spc.coordinator, surepy_entity.id, spc))
+    # connectivity
+    entities.extend(
+        DeviceConnectivity(spc.coordinator, device_id, spc)
+        for device_id in index.connected
+    )
 
-    async_add_entities(entities, True)
+    return entities
 
 
 class SurePetcareBinarySensor(CoordinatorEntity, BinarySensorEntity):
@@ -75,7 +84,7 @@ class SurePetcareBinarySensor(CoordinatorEntity, BinarySensorEntity):
         device_class: str,
     ):
         """Initialize a Sure Petcare binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=_id)
 
         self._id: int = _id
         self._spc: SurePetcareAPI = spc
@@ -84,6 +93,7 @@ class SurePetcareBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
         self._surepy_entity: SurepyEntity = self._coordinator.data[self._id]
         self._state: Any = self._surepy_entity.raw_data().get("status", {})
+        self._view: EntityView = self._coordinator.views[self._id]
 
         type_name = self._surepy_entity.type.name.replace("_", " ").title()
 
@@ -101,49 +111,47 @@ class SurePetcareBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_name: str = f"{type_name} {self._name}"
         self._attr_unique_id = f"{self._surepy_entity.household_id}-{self._id}"
 
-        if self._state:
-            self._attr_extra_state_attributes = {**self._surepy_entity.raw_data()}
+    def _attributes(self) -> dict[str, Any]:
+        """Return the state attributes provided by this entity itself."""
+        return {}
 
-    @property
-    def device_info(self):
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes for the configured attribute profile."""
 
-        device = {}
+        if not self._view.available:
+            return {}
 
-        try:
+        return {**self._attributes(), **self._view.attributes}
 
-            model = f"{self._surepy_entity.type.name.replace('_', ' ').title()}"
-            if serial := self._surepy_entity.raw_data().get("serial_number"):
-                model = f"{model} ({serial})"
-            elif mac_address := self._surepy_entity.raw_data().get("mac_address"):
-                model = f"{model} ({mac_address})"
-            elif tag_id := self._surepy_entity.raw_data().get("tag_id"):
-                model = f"{model} ({tag_id})"
+    def _update_from_view(self) -> None:
+        """Set the state and attributes from the view model."""
+        self._attr_extra_state_attributes = self._build_attributes()
 
-            device = {
-                "identifiers": {(DOMAIN, self._id)},
-                "name": self._surepy_entity.name.capitalize(),
-                "manufacturer": SURE_MANUFACTURER,
-                "model": model,
-            }
+    async def async_added_to_hass(self) -> None:
+        """Set the initial state and attributes."""
+        self._update_from_view()
+        await super().async_added_to_hass()
 
-            if self._state:
-                versions = self._state.get("version", {})
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state and attributes from the new view model."""
 
-                if dev_fw_version := versions.get("device", {}).get("firmware"):
-                    device["sw_version"] = dev_fw_version
+        if self._id in self._coordinator.removed_ids:
+            async_remove_entity(self)
+            return
 
-                if (lcd_version := versions.get("lcd", {})) and (
-                    rf_version := versions.get("rf", {})
-                ):
-                    device["sw_version"] = (
-                        f"lcd: {lcd_version.get('version', lcd_version)['firmware']} | "
-                        f"fw: {rf_version.get('version', rf_version)['firmware']}"
-                    )
+        if surepy_entity := self._coordinator.data.get(self._id):
+            self._surepy_entity = surepy_entity
+            self._view = self._coordinator.views[self._id]
 
-        except AttributeError:
-            pass
+        self._update_from_view()
 
-        return device
+        super()._handle_coordinator_update()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device registry record shared by the entities of the device."""
+        return self._spc.devices.get(self._id, self._surepy_entity)
 
 
 class Hub(SurePetcareBinarySensor):
@@ -156,25 +164,24 @@ class Hub(SurePetcareBinarySensor):
         if self._attr_device_info:
             self._attr_device_info["identifiers"] = {(DOMAIN, str(self._id))}
 
-        self._attr_available = self.is_on
-
-    @property
-    def is_on(self) -> bool:
-        """Return True if the hub is on."""
-
-        hub: SureHub
-        online: bool = False
+        self._attr_available = self._view.online
 
-        if hub := self._coordinator.data[self._id]:
+    def _attributes(self) -> dict[str, Any]:
+        """Return the led and pairing mode of the hub."""
 
-            self._attr_extra_state_attributes = {
-                "led_mode": int(hub.raw_data()["status"]["led_mode"]),
-                "pairing_mode": bool(hub.raw_data()["status"]["pairing_mode"]),
-            }
+        return {
+            "led_mode": self._view.led_mode,
+            "pairing_mode": self._view.pairing_mode,
+        }
 
-            online = hub.online
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes, the hub never exposes its raw data."""
+        return self._attributes() if self._view.available else {}
 
-        return online
+    def _update_from_view(self) -> None:
+        """Set whether the hub is online."""
+        self._attr_is_on = self._view.online
+        super()._update_from_view()
 
 
 class Pet(SurePetcareBinarySensor):
@@ -191,47 +198,22 @@ class Pet(SurePetcareBinarySensor):
         # picture of the pet that can be added via the sure app/website
         self._attr_entity_picture = self._surepy_entity.photo_url
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the additional attrs."""
+    def _attributes(self) -> dict[str, Any]:
+        """Return the location of the pet."""
 
-        pet: SurePet
-        attrs: dict[str, Any] = {}
+        if not (duration := duration_since(self._view.since_dt)):
+            return {}
 
-        if pet := self._coordinator.data[self._id]:
-            since_dt = datetime.fromisoformat(pet.location.since.replace("Z", "+00:00"))
-            now_dt = datetime.now(timezone.utc)
-            duration = now_dt - since_dt
+        return {
+            "since": self._view.since,
+            "where": self._view.where,
+            "for": format_duration(duration),
+        }
 
-            days, remainder = divmod(int(duration.total_seconds()), 86400)  # Calculate days
-            hours, remainder = divmod(remainder, 3600)
-            minutes, _ = divmod(remainder, 60)
-
-            if days > 0:
-                formatted_duration = f"{days}d {hours:02}:{minutes:02}"  # Format with days
-            else:
-                formatted_duration = f"{hours:02}:{minutes:02}"
-
-            attrs = {
-                "since": pet.location.since,
-                "where": pet.location.where,
-                "for": formatted_duration,
-                **pet.raw_data(),
-            }
-
-        return attrs
-
-    @property
-    def is_on(self) -> bool:
-        """Return True if the pet is at home."""
-
-        pet: SurePet
-        inside: bool = False
-
-        if pet := self._coordinator.data[self._id]:
-            inside = bool(pet.location.where == Location.INSIDE)
-
-        return inside
+    def _update_from_view(self) -> None:
+        """Set whether the pet is at home."""
+        self._attr_is_on = bool(self._view.inside)
+        super()._update_from_view()
 
 
 class DeviceConnectivity(SurePetcareBinarySensor):
@@ -247,24 +229,18 @@ class DeviceConnectivity(SurePetcareBinarySensor):
             f"{self._surepy_entity.household_id}-{self._id}-connectivity"
         )
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the additional attrs."""
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return the signal strength of the device and the hub."""
 
-        device: SurepyDevice
-        attrs: dict[str, Any] = {}
+        if not self._view.available or self._view.device_rssi is None:
+            return {}
 
-        if (device := self._coordinator.data[self._id]) and (
-            state := device.raw_data().get("status")
-        ):
-            attrs = {
-                "device_rssi": f'{state["signal"]["device_rssi"]:.2f}',
-                "hub_rssi": f'{state["signal"]["hub_rssi"]:.2f}',
-            }
+        return {
+            "device_rssi": f"{self._view.device_rssi:.2f}",
+            "hub_rssi": f"{self._view.hub_rssi:.2f}",
+        }
 
-        return attrs
-
-    @property
-    def is_on(self) -> bool:
-        """Return True if the pet is at home."""
-        return bool(self.extra_state_attributes)
\ No newline at end of file
+    def _update_from_view(self) -> None:
+        """Set whether the device is connected."""
+        self._attr_is_on = self._view.available
+        super()._update_from_view()
\ No newline at end of file
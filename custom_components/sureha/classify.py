@@ -0,0 +1,102 @@
+"""Classification of the pets and devices by type and capability."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from surepy.entities import SurepyEntity
+from surepy.enums import EntityType
+
+FLAP_TYPES = (EntityType.CAT_FLAP, EntityType.PET_FLAP)
+
+
+@dataclass(frozen=True, slots=True)
+class EntityIndex:
+    """Ids of the pets and devices, grouped for the platforms and services.
+
+    The ids keep the order of the coordinator data.
+    """
+
+    pets: tuple[int, ...] = ()
+    # hubs reporting a led mode
+    hubs: tuple[int, ...] = ()
+    flaps: tuple[int, ...] = ()
+    # flaps reporting a lock state
+    lockable_flaps: tuple[int, ...] = ()
+    feeders: tuple[int, ...] = ()
+    felaquas: tuple[int, ...] = ()
+    # devices connected to a hub
+    connected: tuple[int, ...] = ()
+    # devices reporting a battery voltage
+    batteries: tuple[int, ...] = ()
+    flaps_by_household: Mapping[int, tuple[int, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+
+def classify(surepy_entities: Iterable[SurepyEntity]) -> EntityIndex:
+    """Sort the pets and devices into the index in a single pass."""
+
+    pets: list[int] = []
+    hubs: list[int] = []
+    flaps: list[int] = []
+    lockable_flaps: list[int] = []
+    feeders: list[int] = []
+    felaquas: list[int] = []
+    connected: list[int] = []
+    batteries: list[int] = []
+    flaps_by_household: dict[int, list[int]] = {}
+
+    for surepy_entity in surepy_entities:
+
+        surepy_id = surepy_entity.id
+        status = surepy_entity.raw_data().get("status") or {}
+
+        if surepy_entity.type == EntityType.PET:
+            pets.append(surepy_id)
+            continue
+
+        if surepy_entity.type == EntityType.HUB:
+            if status.get("led_mode"):
+                hubs.append(surepy_id)
+            continue
+
+        if surepy_entity.type in FLAP_TYPES:
+            flaps.append(surepy_id)
+            flaps_by_household.setdefault(surepy_entity.household_id, []).append(
+                surepy_id
+            )
+            if status.get("locking"):
+                lockable_flaps.append(surepy_id)
+
+        elif surepy_entity.type == EntityType.FEEDER:
+            feeders.append(surepy_id)
+
+        elif surepy_entity.type == EntityType.FELAQUA:
+            felaquas.append(surepy_id)
+
+        else:
+            continue
+
+        connected.append(surepy_id)
+
+        if status.get("battery"):
+            batteries.append(surepy_id)
+
+    return EntityIndex(
+        pets=tuple(pets),
+        hubs=tuple(hubs),
+        flaps=tuple(flaps),
+        lockable_flaps=tuple(lockable_flaps),
+        feeders=tuple(feeders),
+        felaquas=tuple(felaquas),
+        connected=tuple(connected),
+        batteries=tuple(batteries),
+        flaps_by_household=MappingProxyType(
+            {
+                household_id: tuple(flap_ids)
+                for household_id, flap_ids in flaps_by_household.items()
+            }
+        ),
+    )
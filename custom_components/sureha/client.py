@@ -0,0 +1,152 @@
+"""Retries and circuit breaker for the Sure Petcare api calls."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from random import uniform
+from time import monotonic
+from typing import Any, Awaitable, Callable, TypeVar
+
+import aiohttp
+import async_timeout
+from surepy.exceptions import (
+    SurePetcareAuthenticationError,
+    SurePetcareConnectionError,
+    SurePetcareError,
+)
+
+# pylint: disable=relative-beyond-top-level
+from .auth import TokenManager
+from .const import (
+    SURE_BREAKER_COOLDOWN,
+    SURE_BREAKER_THRESHOLD,
+    SURE_CALL_TIMEOUT,
+    SURE_RETRY_ATTEMPTS,
+    SURE_RETRY_BACKOFF,
+    SURE_RETRY_BACKOFF_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class CircuitOpenError(SurePetcareError):
+    """Calls are suspended after repeated failures."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True if a later call may succeed, False for a rejected call."""
+
+    if isinstance(error, (asyncio.TimeoutError, SurePetcareConnectionError)):
+        return True
+
+    # surepy raises a plain error for some connection errors of the login
+    cause = error.__cause__
+
+    if isinstance(cause, aiohttp.ClientResponseError):
+        return cause.status == 429 or cause.status >= 500
+
+    return isinstance(cause, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+class ResilientClient:
+    """Retry failed api calls and stop calling a failing api for a while.
+
+    A call failing with a transient error, a timeout, connection error, rate
+    limit or server error, is tried up to ``SURE_RETRY_ATTEMPTS`` times with
+    an exponential, jittered backoff in between. Other errors, like a lock
+    command rejected for an offline flap, are raised right away and do not
+    count as failures. After ``SURE_BREAKER_THRESHOLD`` calls in a row failed,
+    the circuit breaker opens and calls fail immediately for
+    ``SURE_BREAKER_COOLDOWN`` seconds.
+    The first call after the cooldown is a probe: it closes the breaker on
+    success or opens it again on failure.
+
+    surepy does not expose the response headers, so a Retry-After header of
+    a rate limited response can not be honoured and the backoff is used.
+    """
+
+    def __init__(self, tokens: TokenManager) -> None:
+        """Initialize the client."""
+
+        self.tokens = tokens
+
+        self._failures: int = 0
+        self._open_until: float = 0.0
+
+        # number of retried calls and of times the breaker opened
+        self.retries: int = 0
+        self.breaker_trips: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while calls are suspended."""
+        return self._failures >= SURE_BREAKER_THRESHOLD
+
+    async def async_call(
+        self, method: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+    ) -> _T:
+        """Call an api method, retrying on transient errors."""
+
+        if self.is_open and monotonic() < self._open_until:
+            raise CircuitOpenError(
+                f"api calls suspended for {self._open_until - monotonic():.0f}s "
+                f"after {self._failures} failures"
+            )
+
+        # a half open breaker only probes once
+        attempts = 1 if self.is_open else SURE_RETRY_ATTEMPTS
+
+        for attempt in range(attempts):
+
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(
+                    min(SURE_RETRY_BACKOFF * 2 ** (attempt - 1), SURE_RETRY_BACKOFF_MAX)
+                    * uniform(0.5, 1.5)  # nosec
+                )
+
+            try:
+                async with async_timeout.timeout(SURE_CALL_TIMEOUT):
+                    result = await self.tokens.async_call(method, *args, **kwargs)
+
+            except SurePetcareAuthenticationError:
+                raise
+            except (SurePetcareError, asyncio.TimeoutError) as err:
+                if not is_transient(err):
+                    raise
+                error: Exception = err
+                _LOGGER.debug(
+                    "🐾 %s failed (attempt %d/%d): %r",
+                    getattr(method, "__name__", method),
+                    attempt + 1,
+                    attempts,
+                    err,
+                )
+
+            else:
+                if self.is_open:
+                    _LOGGER.info("🐾 api is responding again, resuming calls")
+                self._failures = 0
+                return result
+
+        self._failures += 1
+
+        if self.is_open:
+            if self._failures == SURE_BREAKER_THRESHOLD:
+                self.breaker_trips += 1
+                _LOGGER.warning(
+                    "🐾 \x1b[38;2;255;26;102m·\x1b[0m %d api calls failed in a row, "
+                    "suspending calls for %ds",
+                    self._failures,
+                    SURE_BREAKER_COOLDOWN,
+                )
+            self._open_until = monotonic() + SURE_BREAKER_COOLDOWN
+
+        if isinstance(error, asyncio.TimeoutError):
+            raise SurePetcareConnectionError(
+                f"no response within {SURE_CALL_TIMEOUT}s"
+            ) from error
+
+        raise error
@@ -14,12 +14,20 @@ import voluptuous as vol
 
 # pylint: disable=relative-beyond-top-level
 from .const import (
+    ATTRIBUTE_PROFILE_FULL,
+    ATTRIBUTE_PROFILES,
     ATTR_VOLTAGE_FULL,
     ATTR_VOLTAGE_LOW,
+    CONF_ATTRIBUTE_PROFILE,
+    CONF_INCREMENTAL_UPDATES,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_MIN,
     DOMAIN,
     SURE_API_TIMEOUT,
     SURE_BATT_VOLTAGE_FULL,
     SURE_BATT_VOLTAGE_LOW,
+    SURE_SCAN_INTERVAL_MAX,
+    SURE_SCAN_INTERVAL_MIN,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -130,6 +138,28 @@ class SureHAOptionsFlowHandler(config_entries.OptionsFlow):
                     ATTR_VOLTAGE_FULL, SURE_BATT_VOLTAGE_FULL
                 ),
             ): float,
+            vol.Optional(
+                CONF_ATTRIBUTE_PROFILE,
+                default=self.config_entry.options.get(
+                    CONF_ATTRIBUTE_PROFILE, ATTRIBUTE_PROFILE_FULL
+                ),
+            ): vol.In(ATTRIBUTE_PROFILES),
+            vol.Optional(
+                CONF_SCAN_INTERVAL_MIN,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL_MIN, SURE_SCAN_INTERVAL_MIN
+                ),
+            ): vol.All(int, vol.Range(min=10)),
+            vol.Optional(
+                CONF_SCAN_INTERVAL_MAX,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL_MAX, SURE_SCAN_INTERVAL_MAX
+                ),
+            ): vol.All(int, vol.Range(min=10)),
+            vol.Optional(
+                CONF_INCREMENTAL_UPDATES,
+                default=self.config_entry.options.get(CONF_INCREMENTAL_UPDATES, False),
+            ): bool,
         }
 
         return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
@@ -1,13 +1,59 @@
 """Constants for the Sure Petcare component."""
 DOMAIN = "sureha"
 
-SPC = "spc"
+# maps the ids of pets and devices to their config entry
+SURE_INDEX = f"{DOMAIN}_index"
 
 # platforms
 TOPIC_UPDATE = f"{DOMAIN}_data_update"
 
 # sure petcare api
 SURE_API_TIMEOUT = 60
+# renew the api token this long before it expires (seconds)
+SURE_TOKEN_REFRESH_MARGIN = 3600
+# timeout of a single api call, retries with a jittered exponential backoff
+SURE_CALL_TIMEOUT = 20
+SURE_RETRY_ATTEMPTS = 3
+SURE_RETRY_BACKOFF = 2
+SURE_RETRY_BACKOFF_MAX = 30
+# suspend api calls for 5 minutes after 3 failed calls in a row
+SURE_BREAKER_THRESHOLD = 3
+SURE_BREAKER_COOLDOWN = 300
+
+# polling
+CONF_SCAN_INTERVAL_MIN = "scan_interval_min"
+CONF_SCAN_INTERVAL_MAX = "scan_interval_max"
+SURE_SCAN_INTERVAL = 150
+SURE_SCAN_INTERVAL_MIN = 30
+SURE_SCAN_INTERVAL_MAX = 900
+# keep polling fast for this long after pet or flap activity (seconds)
+SURE_ACTIVITY_WINDOW = 600
+# confirm optimistic lock state and pet location changes after (seconds)
+SURE_CONFIRM_DELAY = 10
+# requested refreshes within a second are coalesced into one, at least 10
+# seconds after the previous refresh started
+SURE_REFRESH_WINDOW = 1
+SURE_REFRESH_SPACING = 10
+# incremental updates, fetch all entities at least every 30 minutes
+CONF_INCREMENTAL_UPDATES = "incremental_updates"
+SURE_FULL_REFRESH_INTERVAL = 1800
+# number of household timelines polled in parallel
+SURE_MAX_PARALLEL_TIMELINES = 4
+# compare names, photos, curfews, ... of pets and devices at least hourly
+SURE_COLD_INTERVAL = 3600
+# back off to the maximum interval between these hours (local time)
+SURE_NIGHT_START = 23
+SURE_NIGHT_END = 6
+
+# number of traced payloads kept for the diagnostics
+SURE_TRACE_BUFFER = 50
+
+# consumption of the feeders and felaquas, rate over the last 24 hours
+SURE_CONSUMPTION_WINDOW = 86400
+# no rate before the window spans at least an hour (seconds)
+SURE_CONSUMPTION_MIN_SPAN = 3600
+# a bowl or felaqua is considered refilled if its level rose by (g or ml)
+SURE_REFILL_THRESHOLD = 5
 
 # device info
 SURE_MANUFACTURER = "Sure Petcare"
@@ -18,12 +64,39 @@ ATTR_VOLTAGE_LOW = "voltage_low"
 SURE_BATT_VOLTAGE_FULL = 1.6
 SURE_BATT_VOLTAGE_LOW = 1.25
 SURE_BATT_VOLTAGE_DIFF = SURE_BATT_VOLTAGE_FULL - SURE_BATT_VOLTAGE_LOW
+SURE_BATT_COUNT = 4
+# the voltage is smoothed over about 6 hours, the discharge slope over 3 days
+SURE_BATT_SMOOTHING = 21600
+SURE_BATT_SLOPE_SMOOTHING = 259200
+# no forecast before the slope was tracked for a day (seconds)
+SURE_BATT_MIN_SPAN = 86400
+# the smoothed battery level only changes by at least (percent)
+SURE_BATT_HYSTERESIS = 3
+# the batteries were replaced if the voltage rose by (volts)
+SURE_BATT_REPLACED = 0.4
+
+# state attributes
+CONF_ATTRIBUTE_PROFILE = "attribute_profile"
+ATTRIBUTE_PROFILE_FULL = "full"
+ATTRIBUTE_PROFILE_CURATED = "curated"
+ATTRIBUTE_PROFILE_MINIMAL = "minimal"
+ATTRIBUTE_PROFILES = [
+    ATTRIBUTE_PROFILE_FULL,
+    ATTRIBUTE_PROFILE_CURATED,
+    ATTRIBUTE_PROFILE_MINIMAL,
+]
 
 # services
 SERVICE_SET_LOCK_STATE = "set_lock_state"
 ATTR_FLAP_ID = "flap_id"
 ATTR_LOCK_STATE = "lock_state"
+ATTR_HOUSEHOLD_ID = "household_id"
+# number of lock state commands sent in parallel
+SURE_MAX_PARALLEL_COMMANDS = 3
 
 SERVICE_PET_LOCATION = "set_pet_location"
 ATTR_PET_ID = "pet_id"
 ATTR_WHERE = "where"
+
+SERVICE_PET_HISTORY = "get_pet_history"
+ATTR_DAYS = "days"
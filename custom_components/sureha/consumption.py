@@ -0,0 +1,152 @@
+"""Consumption analytics of the feeders and felaquas."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from homeassistant.core import callback
+import homeassistant.util.dt as dt_util
+
+# pylint: disable=relative-beyond-top-level
+from .const import (
+    SURE_CONSUMPTION_MIN_SPAN,
+    SURE_CONSUMPTION_WINDOW,
+    SURE_REFILL_THRESHOLD,
+)
+from .views import EntityView
+
+# (device id, index of the feeder bowl or None for a felaqua)
+SeriesKey = tuple[int, int | None]
+
+
+class ConsumptionWindow:
+    """Rolling consumption of a single bowl or water reservoir.
+
+    Every sample is compared with the previous level: a drop is consumption,
+    a rise by at least ``SURE_REFILL_THRESHOLD`` is a refill and smaller rises
+    are noise of the scale. The consumption of the last
+    ``SURE_CONSUMPTION_WINDOW`` seconds is kept in a queue with a running
+    sum, so each sample costs O(1) amortized and nothing is rescanned.
+    """
+
+    __slots__ = (
+        "level",
+        "first_sample",
+        "last_sample",
+        "last_refill",
+        "day",
+        "intake_today",
+        "refills_today",
+        "_drops",
+        "_window_sum",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the window."""
+
+        self.level: float | None = None
+        self.first_sample: float | None = None
+        self.last_sample: float | None = None
+        self.last_refill: datetime | None = None
+
+        self.day: str | None = None
+        self.intake_today: float = 0.0
+        self.refills_today: int = 0
+
+        # (timestamp, consumed) of the drops within the window
+        self._drops: deque[tuple[float, float]] = deque()
+        self._window_sum: float = 0.0
+
+    def sample(self, now: datetime, level: float) -> None:
+        """Add the current level."""
+
+        timestamp = now.timestamp()
+
+        if (today := dt_util.as_local(now).date().isoformat()) != self.day:
+            self.day = today
+            self.intake_today = 0.0
+            self.refills_today = 0
+
+        if self.level is not None:
+            if (consumed := self.level - level) > 0:
+                self._drops.append((timestamp, consumed))
+                self._window_sum += consumed
+                self.intake_today += consumed
+            elif -consumed >= SURE_REFILL_THRESHOLD:
+                self.last_refill = now
+                self.refills_today += 1
+
+        cutoff = timestamp - SURE_CONSUMPTION_WINDOW
+        while self._drops and self._drops[0][0] <= cutoff:
+            self._window_sum -= self._drops.popleft()[1]
+
+        if self.first_sample is None:
+            self.first_sample = timestamp
+
+        self.level = level
+        self.last_sample = timestamp
+
+    @property
+    def rate(self) -> float | None:
+        """Return the average consumption per hour within the window."""
+
+        if self.first_sample is None or self.last_sample is None:
+            return None
+
+        span = min(self.last_sample - self.first_sample, SURE_CONSUMPTION_WINDOW)
+
+        if span < SURE_CONSUMPTION_MIN_SPAN:
+            return None
+
+        return max(self._window_sum, 0.0) / span * 3600
+
+    @property
+    def hours_until_empty(self) -> float | None:
+        """Return the hours until empty at the current rate."""
+
+        if self.level is None or not (rate := self.rate):
+            return None
+
+        return max(self.level, 0.0) / rate
+
+
+class ConsumptionAnalytics:
+    """Consumption windows of all bowls and felaquas of a config entry."""
+
+    def __init__(self) -> None:
+        """Initialize the analytics."""
+        self.windows: dict[SeriesKey, ConsumptionWindow] = {}
+
+    def get(self, device_id: int, bowl: int | None = None) -> ConsumptionWindow:
+        """Return the window of a bowl or felaqua."""
+
+        if (window := self.windows.get((device_id, bowl))) is None:
+            window = self.windows[(device_id, bowl)] = ConsumptionWindow()
+
+        return window
+
+    @callback
+    def async_forget(self, device_ids: Iterable[int]) -> None:
+        """Drop the windows of devices removed from the account."""
+
+        device_ids = set(device_ids)
+
+        self.windows = {
+            key: window
+            for key, window in self.windows.items()
+            if key[0] not in device_ids
+        }
+
+    @callback
+    def async_sample(self, views: Iterable[EntityView]) -> None:
+        """Add the levels of the feeder bowls and felaquas of some view models."""
+
+        now = dt_util.utcnow()
+
+        for view in views:
+            for bowl, weight in view.bowl_weights.items():
+                self.get(view.id, bowl).sample(now, weight)
+
+            if view.water_remaining is not None:
+                self.get(view.id).sample(now, view.water_remaining)
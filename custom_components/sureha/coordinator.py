@@ -0,0 +1,382 @@
+"""Data update coordinator for the Sure Petcare integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import timedelta
+import json
+import logging
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+import homeassistant.util.dt as dt_util
+from surepy.entities import SurepyEntity
+from surepy.enums import EntityType
+
+# pylint: disable=relative-beyond-top-level
+from .const import (
+    SURE_ACTIVITY_WINDOW,
+    SURE_COLD_INTERVAL,
+    SURE_NIGHT_END,
+    SURE_NIGHT_START,
+    SURE_SCAN_INTERVAL,
+    SURE_SCAN_INTERVAL_MAX,
+    SURE_SCAN_INTERVAL_MIN,
+)
+from .classify import EntityIndex, classify
+from .metrics import RefreshMetrics
+from .refresh import RefreshCoalescer
+from .views import EntityView
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# parts of the raw data that change with the activity of the pets and devices,
+# compared on every update, the rest (names, photos, tags, curfews, bowl
+# settings, ...) only on cold updates
+HOT_KEYS = frozenset({"position", "status", "move", "lunch", "drink", "latest_drink"})
+
+
+def payload(surepy_entity: SurepyEntity, hot: bool) -> str:
+    """Return the hot or cold raw api data of an entity as JSON, to fingerprint."""
+
+    raw_data = surepy_entity.raw_data()
+
+    return json.dumps(
+        {key: raw_data[key] for key in HOT_KEYS if key in raw_data}
+        if hot
+        else {key: value for key, value in raw_data.items() if key not in HOT_KEYS},
+        sort_keys=True,
+        default=str,
+    )
+
+
+def activity(surepy_entity: SurepyEntity) -> Any:
+    """Return the part of the data that changes on pet or flap activity."""
+
+    raw_data = surepy_entity.raw_data()
+
+    if surepy_entity.type == EntityType.PET:
+        return json.dumps(raw_data.get("position"), sort_keys=True)
+
+    if surepy_entity.type in [EntityType.CAT_FLAP, EntityType.PET_FLAP]:
+        return json.dumps(raw_data.get("status", {}).get("locking"), sort_keys=True)
+
+    return None
+
+
+class SureDataUpdateCoordinator(DataUpdateCoordinator[dict[int, SurepyEntity]]):
+    """Coordinator that only notifies entities whose data has changed.
+
+    Entities register with their surepy id as listener context. After each
+    update the raw data of every surepy entity is fingerprinted and only
+    listeners with a changed (or without a) context are called.
+
+    The update interval adapts to the activity in the household: it drops to
+    the minimum after a pet moved, a flap changed its lock state or a command
+    was sent and doubles on every idle update up to the default interval, or
+    up to the maximum interval at night.
+
+    The raw data is split into two tiers: the hot part, the position and
+    status of pets and devices, is compared on every update. The cold part,
+    names, photos, tags, curfews, ..., is compared once every
+    ``cold_interval`` seconds, on requested refreshes and after a snapshot or
+    cached data was shown, which saves serializing it on every update.
+
+    The view model of every changed entity is rebuilt once per update with
+    ``view_factory``, the entities only read from it. The pets and devices
+    are classified once per changed update into ``index``, which the
+    platforms and services use. Pets and devices appearing in or vanishing
+    from the data are tracked in ``added_ids`` and ``removed_ids``, so the
+    platforms follow the account without a reload.
+
+    Requested refreshes, of services, entities or ``homeassistant.update_entity``,
+    are coalesced into a single refresh with a minimum spacing.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        interval_min: int = SURE_SCAN_INTERVAL_MIN,
+        interval_max: int = SURE_SCAN_INTERVAL_MAX,
+        cold_interval: int = SURE_COLD_INTERVAL,
+        view_factory: Callable[[SurepyEntity], EntityView],
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+
+        self._fingerprints: dict[int, int] = {}
+        self._cold_fingerprints: dict[int, int] = {}
+        self.cold_interval = cold_interval
+        self._last_cold_update: float = 0.0
+        self._cold_update_requested: bool = True
+        self.cold_updates: int = 0
+        self._activity: dict[int, Any] = {}
+        self._last_notified_success: bool | None = None
+        self._last_activity: float = 0.0
+
+        self._view_factory = view_factory
+        self.views: dict[int, EntityView] = {}
+
+        # ids of the pets and devices by type, rebuilt when the data changed
+        self.index = EntityIndex()
+
+        # pets and devices paired to or removed from the account during the
+        # last update, the platforms add and remove their entities
+        self._known_ids: set[int] = set()
+        self.added_ids: set[int] = set()
+        self.removed_ids: set[int] = set()
+        self.added = EntityIndex()
+
+        self.interval_min = timedelta(seconds=interval_min)
+        self.interval_max = timedelta(seconds=max(interval_min, interval_max))
+
+        # data is from the local snapshot and not yet refreshed
+        self.stale: bool = False
+
+        # ids whose data changed during the last update
+        self.changed_ids: set[int] = set()
+        # number of listener callbacks skipped because nothing changed
+        self.skipped_updates: int = 0
+
+        self.metrics = RefreshMetrics()
+
+        # monotonic time the last refresh started
+        self.last_refresh_started: float = 0.0
+        self.coalescer = RefreshCoalescer(
+            self.hass, self.async_refresh, lambda: self.last_refresh_started
+        )
+
+    @callback
+    def async_request_cold_update(self) -> None:
+        """Compare the cold data as well on the next update."""
+        self._cold_update_requested = True
+
+    @callback
+    def _async_track_changes(self) -> None:
+        """Compare the current data against the last known fingerprints."""
+
+        data = self.data or {}
+
+        payloads = {
+            entity_id: payload(surepy_entity, hot=True)
+            for entity_id, surepy_entity in data.items()
+        }
+        fingerprints = {
+            entity_id: hash(entity_payload)
+            for entity_id, entity_payload in payloads.items()
+        }
+
+        self.changed_ids = {
+            entity_id
+            for entity_id, value in fingerprints.items()
+            if self._fingerprints.get(entity_id) != value
+        } | (self._fingerprints.keys() - fingerprints.keys())
+
+        cold = (
+            self._cold_update_requested
+            or monotonic() - self._last_cold_update >= self.cold_interval
+        )
+
+        # new pets and devices need a first cold fingerprint in any case
+        cold_payloads = {
+            entity_id: payload(surepy_entity, hot=False)
+            for entity_id, surepy_entity in data.items()
+            if cold or entity_id not in self._cold_fingerprints
+        }
+        cold_fingerprints = {
+            entity_id: hash(entity_payload)
+            for entity_id, entity_payload in cold_payloads.items()
+        }
+
+        self.changed_ids |= {
+            entity_id
+            for entity_id, value in cold_fingerprints.items()
+            if self._cold_fingerprints.get(entity_id) != value
+        }
+
+        if cold:
+            self._cold_fingerprints = cold_fingerprints
+            self._last_cold_update = monotonic()
+            self._cold_update_requested = False
+            self.cold_updates += 1
+        else:
+            self._cold_fingerprints.update(cold_fingerprints)
+            for entity_id in self._cold_fingerprints.keys() - data.keys():
+                del self._cold_fingerprints[entity_id]
+
+        # removed entities are changed as well, but have no activity
+        activities = {
+            entity_id: activity(self.data[entity_id])
+            for entity_id in self.changed_ids & fingerprints.keys()
+        }
+
+        # the very first update is not considered activity
+        if self._fingerprints and any(
+            self._activity.get(entity_id) != value
+            for entity_id, value in activities.items()
+        ):
+            self.async_boost()
+
+        self._activity.update(activities)
+        self._fingerprints = fingerprints
+
+        # the JSON is ascii, its length is the number of bytes
+        self.metrics.record_payload(
+            sum(map(len, payloads.values())) + sum(map(len, cold_payloads.values())),
+            len(payloads),
+            len(self.changed_ids),
+        )
+
+        self.views = {
+            entity_id: self._view_factory(surepy_entity)
+            if entity_id in self.changed_ids or entity_id not in self.views
+            else self.views[entity_id]
+            for entity_id, surepy_entity in (self.data or {}).items()
+        }
+
+        if self.changed_ids:
+            self.index = classify((self.data or {}).values())
+
+        self._async_track_ids()
+
+    @callback
+    def _async_track_ids(self) -> None:
+        """Find the pets and devices paired or removed since the last update."""
+
+        data = self.data or {}
+
+        self.added_ids = data.keys() - self._known_ids
+        # an empty response is rather an api glitch than an emptied account
+        self.removed_ids = self._known_ids - data.keys() if data else set()
+
+        self._known_ids = (self._known_ids | self.added_ids) - self.removed_ids
+
+        for entity_id in self.removed_ids:
+            self._activity.pop(entity_id, None)
+
+        self.added = (
+            classify(
+                surepy_entity
+                for entity_id, surepy_entity in data.items()
+                if entity_id in self.added_ids
+            )
+            if self.added_ids
+            else EntityIndex()
+        )
+
+    @callback
+    def async_boost(self) -> None:
+        """Poll with the minimum interval for a while."""
+        self._last_activity = monotonic()
+        self.update_interval = self.interval_min
+
+    @callback
+    def _async_adjust_interval(self) -> None:
+        """Back off if nothing happened for a while."""
+
+        if monotonic() - self._last_activity < SURE_ACTIVITY_WINDOW:
+            self.update_interval = self.interval_min
+            return
+
+        idle_max = (
+            self.interval_max
+            if self._is_night()
+            else min(
+                max(timedelta(seconds=SURE_SCAN_INTERVAL), self.interval_min),
+                self.interval_max,
+            )
+        )
+
+        self.update_interval = min(
+            (self.update_interval or self.interval_min) * 2, idle_max
+        )
+
+    @staticmethod
+    def _is_night() -> bool:
+        """Return True during the night hours."""
+        hour = dt_util.now().hour
+        return hour >= SURE_NIGHT_START or hour < SURE_NIGHT_END
+
+    async def _async_update_data(self) -> dict[int, SurepyEntity]:
+        """Fetch the data and track which entities changed."""
+
+        started = self.last_refresh_started = monotonic()
+
+        # a failed refresh still calls every listener, which must not see the
+        # changes, additions and removals of the previous update again
+        self.changed_ids = set()
+        self.added_ids = set()
+        self.removed_ids = set()
+        self.added = EntityIndex()
+
+        # the snapshot or cached data may be older than the last cold update
+        if self.stale:
+            self.async_request_cold_update()
+
+        try:
+            data = await super()._async_update_data()
+        except Exception:
+            self.metrics.record_refresh(monotonic() - started, success=False)
+            raise
+
+        # stale data is cached data served while the api is failing
+        self.metrics.record_refresh(monotonic() - started, success=not self.stale)
+
+        self.data = data
+        self._async_track_changes()
+        self._async_adjust_interval()
+
+        _LOGGER.debug(
+            "🐾 %d entities changed, next update in %s",
+            len(self.changed_ids),
+            self.update_interval,
+        )
+
+        return data
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, coalesced with all other requests."""
+        self.async_request_cold_update()
+        await self.coalescer.async_request()
+
+    async def async_shutdown(self) -> None:
+        """Cancel a requested refresh and stop refreshing."""
+        self.coalescer.async_cancel()
+        await super().async_shutdown()
+
+    @callback
+    def async_set_updated_data(self, data: dict[int, SurepyEntity]) -> None:
+        """Manually update data and track which entities changed."""
+
+        self.data = data
+        self._async_track_changes()
+
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose data has changed."""
+
+        # availability changed, every entity has to write its state
+        notify_all = self.last_update_success != self._last_notified_success
+        self._last_notified_success = self.last_update_success
+
+        skipped = 0
+
+        listeners = list(self._listeners.values())
+
+        for update_callback, context in listeners:
+            if notify_all or context is None or context in self.changed_ids:
+                update_callback()
+            else:
+                skipped += 1
+
+        self.skipped_updates += skipped
+        self.metrics.state_writes += len(listeners) - skipped
+
+        _LOGGER.debug(
+            "🐾 %d entities changed, %d updates skipped", len(self.changed_ids), skipped
+        )
@@ -2,17 +2,16 @@
 
 import logging
 from typing import Any
-from datetime import datetime, timezone, timedelta
 
 from homeassistant.components.device_tracker.config_entry import ScannerEntity
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from surepy.entities import EntityType
 from surepy.entities.pet import Pet as SurePet
-from surepy.enums import Location
 
 # pylint: disable=relative-beyond-top-level
-from . import DOMAIN, SurePetcareAPI
-from .const import SPC
+from . import DOMAIN, SurePetcareAPI, async_remove_entity
+from .since import duration_since, format_duration
+from .views import EntityView
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,17 +21,28 @@ SOURCE_TYPE_FLAP = "flap"
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Pet tracker from config entry."""
 
-    spc: SurePetcareAPI = hass.data[DOMAIN][SPC]
+    spc: SurePetcareAPI = hass.data[DOMAIN][config_entry.entry_id]
 
     async_add_entities(
         [
-            SureDeviceTracker(spc.coordinator, pet.id, spc)
-            for pet in spc.coordinator.data.values()
-            if pet.type == EntityType.PET
-        ],
-        True,
+            SureDeviceTracker(spc.coordinator, pet_id, spc)
+            for pet_id in spc.coordinator.index.pets
+        ]
     )
 
+    @callback
+    def async_add_paired() -> None:
+        """Add the trackers of pets added to the account."""
+        if spc.coordinator.added.pets:
+            async_add_entities(
+                [
+                    SureDeviceTracker(spc.coordinator, pet_id, spc)
+                    for pet_id in spc.coordinator.added.pets
+                ]
+            )
+
+    config_entry.async_on_unload(spc.coordinator.async_add_listener(async_add_paired))
+
 
 class SureDeviceTracker(CoordinatorEntity, ScannerEntity):
     """Pet device tracker."""
@@ -42,7 +52,7 @@ class SureDeviceTracker(CoordinatorEntity, ScannerEntity):
 
     def __init__(self, coordinator, _id: int, spc: SurePetcareAPI):
         """Initialize the tracker."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=_id)
 
         self._spc: SurePetcareAPI = spc
         self._coordinator = coordinator
@@ -54,6 +64,7 @@ class SureDeviceTracker(CoordinatorEntity, ScannerEntity):
         self._attr_unique_id = f"{self._id}_pet_tracker"
 
         self._surepy_entity: SurePet = self._coordinator.data[self._id]
+        self._view: EntityView = self._coordinator.views[self._id]
         type_name = self._surepy_entity.type.name.replace("_", " ").title()
         name: str = (
             # cover edge case where a device has no name set
@@ -68,52 +79,50 @@ class SureDeviceTracker(CoordinatorEntity, ScannerEntity):
         # picture of the pet that can be added via the sure app/website
         self._attr_entity_picture = self._surepy_entity.photo_url
 
-    @property
-    def is_connected(self) -> bool:
-        """Return true if the device is connected to the network."""
-        return bool(self.location_name == "home")
+    async def async_added_to_hass(self) -> None:
+        """Build the initial state attributes."""
+        self._attr_extra_state_attributes = self._build_attributes()
+        await super().async_added_to_hass()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the additional attrs."""
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Rebuild the state attributes from the changed coordinator data."""
 
-        pet: SurePet
-        attrs: dict[str, Any] = {}
+        if self._id in self._coordinator.removed_ids:
+            async_remove_entity(self)
+            return
 
-        if pet := self._coordinator.data[self._id]:
-            since_dt = datetime.fromisoformat(pet.location.since.replace("Z", "+00:00"))
-            now_dt = datetime.now(timezone.utc)
-            duration = now_dt - since_dt
+        if pet := self._coordinator.data.get(self._id):
+            self._surepy_entity = pet
+            self._view = self._coordinator.views[self._id]
 
-            days, remainder = divmod(int(duration.total_seconds()), 86400)  # Calculate days
-            hours, remainder = divmod(remainder, 3600)
-            minutes, _ = divmod(remainder, 60)
+        self._attr_extra_state_attributes = self._build_attributes()
 
-            if days > 0:
-                formatted_duration = f"{days}d {hours:02}:{minutes:02}"  # Format with days
-            else:
-                formatted_duration = f"{hours:02}:{minutes:02}"
+        super()._handle_coordinator_update()
 
-            attrs = {
-                "since": pet.location.since,
-                "where": pet.location.where,
-                "for": formatted_duration,
-                **pet.raw_data(),
-            }
+    @property
+    def is_connected(self) -> bool:
+        """Return true if the device is connected to the network."""
+        return bool(self.location_name == "home")
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes for the configured attribute profile."""
 
-        return attrs
+        if not (duration := duration_since(self._view.since_dt)):
+            return {}
+
+        return {
+            "since": self._view.since,
+            "where": self._view.where,
+            "for": format_duration(duration),
+            **self._view.attributes,
+        }
 
     @property
     def location_name(self) -> str:
         """Return 'home' if the pet is at home."""
 
-        pet: SurePet
-        inside: bool = False
-
-        if pet := self._coordinator.data[self._id]:
-            inside = bool(pet.location.where == Location.INSIDE)
-
-        return "home" if inside else "not_home"
+        return "home" if self._view.inside else "not_home"
 
     @property
     def source_type(self):
@@ -0,0 +1,161 @@
+"""Device registry records of the Sure Petcare pets and devices."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from surepy.entities import SurepyEntity
+
+# pylint: disable=relative-beyond-top-level
+from .const import DOMAIN, SURE_MANUFACTURER
+
+_LOGGER = logging.getLogger(__name__)
+
+# name, model and firmware version of a pet or device
+DeviceRecord = tuple[str, str, Any]
+
+
+def device_record(surepy_entity: SurepyEntity) -> DeviceRecord | None:
+    """Return what the device registry shows of a pet or device."""
+
+    try:
+
+        raw_data = surepy_entity.raw_data()
+
+        model = f"{surepy_entity.type.name.replace('_', ' ').title()}"
+        if serial := raw_data.get("serial_number"):
+            model = f"{model} ({serial})"
+        elif mac_address := raw_data.get("mac_address"):
+            model = f"{model} ({mac_address})"
+        elif tag_id := raw_data.get("tag_id"):
+            model = f"{model} ({tag_id})"
+
+        sw_version = None
+        versions = (raw_data.get("status") or {}).get("version", {})
+
+        if dev_fw_version := versions.get("device", {}).get("firmware"):
+            sw_version = dev_fw_version
+
+        if (lcd_version := versions.get("lcd", {})) and (
+            rf_version := versions.get("rf", {})
+        ):
+            sw_version = (
+                f"lcd: {lcd_version.get('version', lcd_version)['firmware']} | "
+                f"fw: {rf_version.get('version', rf_version)['firmware']}"
+            )
+
+        return surepy_entity.name.capitalize(), model, sw_version
+
+    except AttributeError:
+        return None
+
+
+class DeviceInfoCache:
+    """Device registry records shared by all entities of a pet or device.
+
+    A record is built once and only rebuilt when the name, model or firmware
+    of its pet or device changed. Home Assistant reads the device info only
+    when an entity is added, so a new firmware version is written to the
+    device registry here, and only then.
+
+    The records are keyed by the device id of the entities, the feeder bowls
+    have devices of their own built from their feeder.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+
+        self.hass = hass
+
+        self._records: dict[int, DeviceRecord | None] = {}
+        self._infos: dict[int, DeviceInfo] = {}
+        # device ids by the id of the pet or device they are built from
+        self._device_ids: dict[int, set[int]] = {}
+
+        # firmware versions written to the device registry
+        self.registry_updates: int = 0
+
+    def _build(self, device_id: int, record: DeviceRecord | None) -> None:
+        """Build and cache the device info of a record."""
+
+        info = DeviceInfo()
+
+        if record:
+            name, model, sw_version = record
+            info = DeviceInfo(
+                identifiers={(DOMAIN, device_id)},
+                name=name,
+                manufacturer=SURE_MANUFACTURER,
+                model=model,
+            )
+            if sw_version:
+                info["sw_version"] = sw_version
+
+        self._records[device_id] = record
+        self._infos[device_id] = info
+
+    def get(self, device_id: int, surepy_entity: SurepyEntity) -> DeviceInfo:
+        """Return the device info of a device built from a pet or device."""
+
+        if device_id not in self._infos:
+            self._build(device_id, device_record(surepy_entity))
+            self._device_ids.setdefault(surepy_entity.id, set()).add(device_id)
+
+        return self._infos[device_id]
+
+    @callback
+    def async_update(self, surepy_entities: Iterable[SurepyEntity]) -> None:
+        """Rebuild the records of changed pets and devices, write new firmware."""
+
+        device_registry: dr.DeviceRegistry | None = None
+
+        for surepy_entity in surepy_entities:
+
+            # devices not yet shown by any entity are built on first use
+            if not (device_ids := self._device_ids.get(surepy_entity.id)):
+                continue
+
+            record = device_record(surepy_entity)
+
+            for device_id in device_ids:
+
+                if (previous := self._records[device_id]) == record:
+                    continue
+
+                self._build(device_id, record)
+
+                # only a new firmware is written, a renamed device keeps the
+                # name it was registered with
+                if not record or (previous and previous[2] == record[2]):
+                    continue
+
+                device_registry = device_registry or dr.async_get(self.hass)
+
+                if device := device_registry.async_get_device(
+                    identifiers={(DOMAIN, device_id)}
+                ):
+                    _LOGGER.debug(
+                        "🐾 firmware of %s is now %s", surepy_entity.name, record[2]
+                    )
+                    device_registry.async_update_device(
+                        device.id, sw_version=record[2]
+                    )
+                    self.registry_updates += 1
+
+    @callback
+    def async_forget(self, surepy_ids: Iterable[int]) -> set[int]:
+        """Drop the records of removed pets and devices, return their device ids."""
+
+        forgotten: set[int] = set()
+
+        for surepy_id in surepy_ids:
+            for device_id in self._device_ids.pop(surepy_id, set()):
+                self._records.pop(device_id, None)
+                self._infos.pop(device_id, None)
+                forgotten.add(device_id)
+
+        return forgotten
@@ -0,0 +1,56 @@
+"""Diagnostics support for Sure Petcare."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+# pylint: disable=relative-beyond-top-level
+from . import SurePetcareAPI
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME, "email_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including the raw api data."""
+
+    spc: SurePetcareAPI = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "stale": spc.coordinator.stale,
+        "token": {
+            "logins": spc.tokens.logins,
+            "expires": (
+                dt_util.utc_from_timestamp(expires).isoformat()
+                if (expires := spc.tokens.expires)
+                else None
+            ),
+        },
+        "updates": {
+            "incremental": spc.updater.incremental_updates,
+            "full": spc.updater.full_updates,
+            "timeline_failures": spc.updater.timeline_failures,
+            "cold": spc.coordinator.cold_updates,
+            "device_registry": spc.devices.registry_updates,
+            "retries": spc.client.retries,
+            "breaker_trips": spc.client.breaker_trips,
+            "breaker_open": spc.client.is_open,
+            "refresh_requests": spc.coordinator.coalescer.requests,
+            "requested_refreshes": spc.coordinator.coalescer.refreshes,
+        },
+        "metrics": spc.coordinator.metrics.as_dict()
+        | {"skipped_updates": spc.coordinator.skipped_updates},
+        "trace": async_redact_data(list(spc.tracer.buffer), TO_REDACT),
+        "raw_data": {
+            str(entity_id): async_redact_data(surepy_entity.raw_data(), TO_REDACT)
+            for entity_id, surepy_entity in (spc.coordinator.data or {}).items()
+        },
+    }
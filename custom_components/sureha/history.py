@@ -0,0 +1,389 @@
+"""Local history of pet movements, feedings and drinks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, fields
+from datetime import date, timedelta
+import logging
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
+import homeassistant.util.dt as dt_util
+from surepy.entities import SurepyEntity
+from surepy.enums import Location
+
+# pylint: disable=relative-beyond-top-level
+from .const import DOMAIN
+from .since import parse_since
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_MOVEMENT = "movement"
+KIND_FEEDING = "feeding"
+KIND_DRINKING = "drinking"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    pet_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (pet_id, ts, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS days (
+    pet_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    time_outside REAL NOT NULL,
+    outside_since REAL,
+    visits INTEGER NOT NULL,
+    food_eaten REAL NOT NULL,
+    meals INTEGER NOT NULL,
+    last_meal REAL,
+    water_drunk REAL NOT NULL,
+    drinks INTEGER NOT NULL,
+    PRIMARY KEY (pet_id, day)
+) WITHOUT ROWID;
+"""
+
+# (pet id, timestamp, kind, value)
+Event = tuple[int, float, str, float]
+
+
+def history_path(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the path of the history database of a config entry."""
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.history.db"))
+
+
+def pet_events(pet: SurepyEntity) -> list[Event]:
+    """Return the latest movement, feeding and drinking of a pet as events."""
+
+    status = pet.raw_data().get("status") or {}
+    events: list[Event] = []
+
+    position = pet.raw_data().get("position") or {}
+    if since := parse_since(position.get("since")):
+        events.append((pet.id, since.timestamp(), KIND_MOVEMENT, position["where"]))
+
+    # a negative change is the amount eaten or drunk
+    for kind, state in [
+        (KIND_FEEDING, status.get("feeding")),
+        (KIND_DRINKING, status.get("drinking")),
+    ]:
+        if state and (at := parse_since(state.get("at"))):
+            events.append(
+                (pet.id, at.timestamp(), kind, -sum(state.get("change") or [0.0]))
+            )
+
+    return events
+
+
+@dataclass(slots=True)
+class PetDay:
+    """Aggregates of a pet for one day, updated with every new event."""
+
+    day: str
+    time_outside: float = 0.0
+    # start of the current visit outside, it may have started on an earlier day
+    outside_since: float | None = None
+    visits: int = 0
+    food_eaten: float = 0.0
+    meals: int = 0
+    last_meal: float | None = None
+    water_drunk: float = 0.0
+    drinks: int = 0
+
+    @property
+    def start(self) -> float:
+        """Return the timestamp of the start of the day."""
+        return dt_util.start_of_local_day(date.fromisoformat(self.day)).timestamp()
+
+    def time_outside_until(self, timestamp: float) -> float:
+        """Return the seconds spent outside this day, including the current visit."""
+
+        if self.outside_since is None:
+            return self.time_outside
+
+        started = max(self.outside_since, self.start)
+
+        return self.time_outside + max(timestamp - started, 0)
+
+    def apply(self, kind: str, timestamp: float, value: float) -> None:
+        """Add an event of this day."""
+
+        if kind == KIND_MOVEMENT:
+            if value == Location.OUTSIDE.value:
+                if self.outside_since is None:
+                    self.visits += timestamp >= self.start
+                    self.outside_since = timestamp
+            elif self.outside_since is not None:
+                self.time_outside = self.time_outside_until(timestamp)
+                self.outside_since = None
+
+        elif kind == KIND_FEEDING and value > 0:
+            self.food_eaten += value
+            self.meals += 1
+            self.last_meal = value
+
+        elif kind == KIND_DRINKING and value > 0:
+            self.water_drunk += value
+            self.drinks += 1
+
+    def next_day(self, day: str) -> PetDay:
+        """Close this day and return the following one."""
+
+        following = PetDay(day, outside_since=self.outside_since)
+
+        # count the visit that is still going on up to midnight
+        self.time_outside = self.time_outside_until(following.start)
+        self.outside_since = None
+
+        return following
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the aggregates for the history service."""
+
+        now = dt_util.utcnow().timestamp()
+
+        return {
+            "time_outside": round(self.time_outside_until(now)),
+            "visits": self.visits,
+            "food_eaten": round(self.food_eaten, 1),
+            "meals": self.meals,
+            "grams_per_meal": (
+                round(self.food_eaten / self.meals, 1) if self.meals else None
+            ),
+            "water_drunk": round(self.water_drunk, 1),
+            "drinks": self.drinks,
+        }
+
+
+COLUMNS = [field.name for field in fields(PetDay)]
+
+
+class EventHistory:
+    """Append only store of the pet events with daily aggregates.
+
+    The latest movement, feeding and drinking of every changed pet is
+    inserted into a local SQLite database, indexed by pet and time. Each
+    newly inserted event updates the aggregates of its day in memory and in
+    the database, so the sensors and the history service never scan the
+    events. Movements between two updates are not reported by the api and
+    can not be recorded.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history."""
+
+        self.hass = hass
+        self.path = history_path(hass, entry_id)
+
+        self._connection: sqlite3.Connection | None = None
+        # database calls run one after another in the executor
+        self._lock = asyncio.Lock()
+
+        self._days: dict[int, PetDay] = {}
+        self._latest: dict[tuple[int, str], float] = {}
+        self._listeners: dict[int, dict[CALLBACK_TYPE, None]] = {}
+
+    @staticmethod
+    def _today() -> str:
+        """Return the current local date."""
+        return dt_util.now().date().isoformat()
+
+    async def _async_execute(self, function: Any, *args: Any) -> Any:
+        """Run a database function in the executor."""
+
+        async with self._lock:
+            return await self.hass.async_add_executor_job(function, *args)
+
+    def _open(self) -> list[tuple[Any, ...]]:
+        """Open the database and return the latest day of every pet."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+        return self._connection.execute(
+            f"SELECT pet_id, {', '.join(COLUMNS)} FROM days AS latest "  # nosec
+            "WHERE day = (SELECT MAX(day) FROM days WHERE pet_id = latest.pet_id)"
+        ).fetchall()
+
+    async def async_setup(self) -> None:
+        """Open the database and load the aggregates."""
+
+        try:
+            latest_days = await self._async_execute(self._open)
+        except sqlite3.Error as error:
+            _LOGGER.warning("🐾 pet events are not recorded: %s", error)
+            return
+
+        for pet_id, *values in latest_days:
+            self._days[pet_id] = PetDay(*values)
+
+    async def async_close(self) -> None:
+        """Close the database."""
+
+        if self._connection:
+            await self._async_execute(self._connection.close)
+            self._connection = None
+
+    def _insert(self, events: list[Event]) -> list[Event]:
+        """Insert events and return the ones that were not known yet."""
+
+        if not self._connection:
+            return []
+
+        inserted = [
+            event
+            for event in events
+            if self._connection.execute(
+                "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?)", event
+            ).rowcount
+        ]
+        self._connection.commit()
+
+        return inserted
+
+    def _save_days(self, days: list[tuple[int, PetDay]]) -> None:
+        """Write the aggregates of some days."""
+
+        if not self._connection:
+            return
+
+        self._connection.executemany(
+            f"INSERT OR REPLACE INTO days VALUES (?, {', '.join('?' * len(COLUMNS))})",
+            [(pet_id, *asdict(day).values()) for pet_id, day in days],
+        )
+        self._connection.commit()
+
+    def _select_days(self, pet_id: int, first_day: str) -> list[tuple[Any, ...]]:
+        """Return the aggregates of a pet since a day."""
+
+        if not self._connection:
+            return []
+
+        return self._connection.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM days "  # nosec
+            "WHERE pet_id = ? AND day >= ? ORDER BY day",
+            (pet_id, first_day),
+        ).fetchall()
+
+    def _day(self, pet_id: int, closed: list[tuple[int, PetDay]]) -> PetDay:
+        """Return the current day of a pet, closing the previous one."""
+
+        today = self._today()
+
+        if (day := self._days.get(pet_id)) is None:
+            day = self._days[pet_id] = PetDay(today)
+        elif day.day != today:
+            self._days[pet_id] = day.next_day(today)
+            closed.append((pet_id, day))
+            day = self._days[pet_id]
+
+        return day
+
+    @callback
+    def today(self, pet_id: int) -> PetDay:
+        """Return the aggregates of a pet for today."""
+
+        closed: list[tuple[int, PetDay]] = []
+        day = self._day(pet_id, closed)
+
+        if closed:
+            self.hass.async_create_task(self._async_execute(self._save_days, closed))
+
+        return day
+
+    async def _async_today(self, pet_id: int) -> PetDay:
+        """Return the aggregates of a pet for today, writing a finished day first."""
+
+        closed: list[tuple[int, PetDay]] = []
+        day = self._day(pet_id, closed)
+
+        if closed:
+            await self._async_execute(self._save_days, closed)
+
+        return day
+
+    @callback
+    def async_add_listener(
+        self, pet_id: int, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call ``update_callback`` after new events of a pet were recorded."""
+
+        self._listeners.setdefault(pet_id, {})[update_callback] = None
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.get(pet_id, {}).pop(update_callback, None)
+
+        return remove_listener
+
+    @callback
+    def async_record(self, pets: Iterable[SurepyEntity]) -> None:
+        """Record the latest events of some pets."""
+
+        events = [
+            event
+            for pet in pets
+            for event in pet_events(pet)
+            if self._latest.get((event[0], event[2])) != event[1]
+        ]
+
+        if events and self._connection:
+            for pet_id, timestamp, kind, _ in events:
+                self._latest[(pet_id, kind)] = timestamp
+
+            self.hass.async_create_task(self._async_record(events))
+
+    async def _async_record(self, events: list[Event]) -> None:
+        """Insert the events and update the aggregates."""
+
+        try:
+            inserted = await self._async_execute(self._insert, events)
+        except sqlite3.Error as error:
+            _LOGGER.warning("🐾 could not record pet events: %s", error)
+            return
+
+        if not inserted:
+            return
+
+        changed: list[tuple[int, PetDay]] = []
+
+        for pet_id, timestamp, kind, value in sorted(inserted, key=lambda e: e[1]):
+            day = self._day(pet_id, changed)
+
+            # late events of earlier days only update the current visit
+            if timestamp >= day.start or kind == KIND_MOVEMENT:
+                day.apply(kind, timestamp, value)
+
+            changed.append((pet_id, day))
+
+        # a pet can have a closed and a new day
+        days = {(pet_id, day.day): (pet_id, day) for pet_id, day in changed}
+
+        await self._async_execute(self._save_days, list(days.values()))
+
+        for pet_id, _ in days.values():
+            for update_callback in list(self._listeners.get(pet_id, {})):
+                update_callback()
+
+    async def async_days(self, pet_id: int, days: int) -> dict[str, dict[str, Any]]:
+        """Return the daily aggregates of a pet for the last days."""
+
+        # make sure a finished day is written before reading
+        await self._async_today(pet_id)
+
+        first_day = (dt_util.now().date() - timedelta(days=days - 1)).isoformat()
+
+        return {
+            values[0]: PetDay(*values).as_dict()
+            for values in await self._async_execute(
+                self._select_days, pet_id, first_day
+            )
+        }
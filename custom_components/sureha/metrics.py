@@ -0,0 +1,87 @@
+"""Timing and size metrics of the coordinator refreshes."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# upper bounds of the refresh latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 60.0)
+
+
+class RefreshMetrics:
+    """Counters and a latency histogram of the coordinator refreshes.
+
+    Everything is a fixed number of counters, updated in O(1) per refresh.
+    The payload size is the length of the JSON of the surepy entities,
+    which the coordinator serializes anyway to fingerprint them: only the hot
+    data on most updates, all data on cold updates. surepy does not expose
+    the responses, so the bytes on the wire are not known.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+
+        self.refreshes: int = 0
+        self.failures: int = 0
+
+        # the last bucket counts the refreshes slower than the last bound
+        self.latency_buckets: list[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum: float = 0.0
+        self.latency_max: float = 0.0
+        self.latency_last: float | None = None
+
+        self.payload_bytes: int = 0
+        self.payload_bytes_total: int = 0
+
+        self.entities: int = 0
+        self.changed_entities: int = 0
+        # listener callbacks after the refreshes, apart from a few internal
+        # listeners every callback is an entity writing its state
+        self.state_writes: int = 0
+
+    def record_refresh(self, latency: float, success: bool) -> None:
+        """Record the duration and result of a refresh."""
+
+        self.refreshes += 1
+        self.failures += not success
+
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_last = latency
+
+    def record_payload(self, payload_bytes: int, entities: int, changed: int) -> None:
+        """Record the size of the data of a refresh."""
+
+        self.payload_bytes = payload_bytes
+        self.payload_bytes_total += payload_bytes
+        self.entities = entities
+        self.changed_entities = changed
+
+    @property
+    def latency_mean(self) -> float | None:
+        """Return the mean refresh latency."""
+        return self.latency_sum / self.refreshes if self.refreshes else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for the diagnostics."""
+
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "latency": {
+                "last": self.latency_last,
+                "mean": self.latency_mean,
+                "max": self.latency_max,
+                "histogram": {
+                    f"<={bound}s": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)
+                }
+                | {f">{LATENCY_BUCKETS[-1]}s": self.latency_buckets[-1]},
+            },
+            "payload_bytes": self.payload_bytes,
+            "payload_bytes_total": self.payload_bytes_total,
+            "entities": self.entities,
+            "changed_entities": self.changed_entities,
+            "state_writes": self.state_writes,
+        }
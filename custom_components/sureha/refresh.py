@@ -0,0 +1,95 @@
+"""Coalescing of the requested refreshes."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from time import monotonic
+
+from homeassistant.core import HomeAssistant, callback
+
+# pylint: disable=relative-beyond-top-level
+from .const import SURE_REFRESH_SPACING, SURE_REFRESH_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RefreshCoalescer:
+    """Collapse any number of refresh requests into a single refresh.
+
+    The first request schedules a refresh ``SURE_REFRESH_WINDOW`` seconds
+    later and every request until then joins it, all callers await the same
+    refresh. Requests arriving while it runs join the next one, as the
+    running refresh may have fetched the data before their change. A
+    refresh never starts earlier than ``SURE_REFRESH_SPACING`` seconds after
+    the previous one to stay clear of the rate limit of the api.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        refresh: Callable[[], Awaitable[None]],
+        last_refresh: Callable[[], float],
+        window: float = SURE_REFRESH_WINDOW,
+        spacing: float = SURE_REFRESH_SPACING,
+    ) -> None:
+        """Initialize the coalescer."""
+
+        self.hass = hass
+        self._refresh = refresh
+        # monotonic time the previous refresh started, of any origin
+        self._last_refresh = last_refresh
+        self.window = window
+        self.spacing = spacing
+
+        self._queued: asyncio.Task[None] | None = None
+        self._running: asyncio.Task[None] | None = None
+
+        # requests joining the queued refresh
+        self._waiting: int = 0
+
+        # number of requests and of refreshes they caused
+        self.requests: int = 0
+        self.refreshes: int = 0
+
+    async def async_request(self) -> None:
+        """Request a refresh and wait until it finished."""
+
+        self.requests += 1
+        self._waiting += 1
+
+        if self._queued is None:
+            self._queued = self.hass.async_create_task(self._async_run())
+
+        # a cancelled caller must not cancel the refresh of the others
+        await asyncio.shield(self._queued)
+
+    async def _async_run(self) -> None:
+        """Wait for the running refresh and the window, then refresh."""
+
+        if self._running:
+            await asyncio.shield(self._running)
+
+        await asyncio.sleep(
+            max(self.window, self._last_refresh() + self.spacing - monotonic())
+        )
+
+        self._running, self._queued = self._queued, None
+        self.refreshes += 1
+
+        _LOGGER.debug("🐾 refreshing for %d requests", self._waiting)
+        self._waiting = 0
+
+        try:
+            await self._refresh()
+        finally:
+            self._running = None
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel a queued refresh."""
+
+        if self._queued:
+            self._queued.cancel()
+            self._queued = None
+            self._waiting = 0
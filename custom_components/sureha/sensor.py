@@ -2,25 +2,29 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 import logging
-import pprint
-import random
 from typing import Any, cast
-from datetime import datetime, timezone, timedelta
 
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_VOLTAGE,
+    EntityCategory,
+    UnitOfInformation,
     UnitOfMass,
+    UnitOfTime,
     PERCENTAGE,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import homeassistant.util.dt as dt_util
 from surepy.entities import SurepyEntity
 from surepy.entities.devices import (
     Feeder as SureFeeder,
@@ -29,19 +33,23 @@ from surepy.entities.devices import (
     Flap as SureFlap,
     SurepyDevice,
 )
-from surepy.enums import EntityType, LockState
+from surepy.enums import EntityType
 
 # pylint: disable=relative-beyond-top-level
-from . import SurePetcareAPI
+from . import SurePetcareAPI, async_remove_entity
+from .classify import EntityIndex
 from .const import (
     ATTR_VOLTAGE_FULL,
     ATTR_VOLTAGE_LOW,
     DOMAIN,
-    SPC,
     SURE_BATT_VOLTAGE_FULL,
     SURE_BATT_VOLTAGE_LOW,
-    SURE_MANUFACTURER,
 )
+from .consumption import ConsumptionWindow
+from .history import PetDay
+from .since import duration_since
+from .trace import TRACE_ENTITIES
+from .views import EntityView
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -63,72 +71,89 @@ async def async_setup_entry(
 ) -> None:
     """Set up config entry Sure PetCare Flaps sensors."""
 
-    entities: list[Flap | Felaqua | Feeder | FeederBowl | Battery] = []
+    spc: SurePetcareAPI = hass.data[DOMAIN][config_entry.entry_id]
 
-    spc: SurePetcareAPI = hass.data[DOMAIN][SPC]
+    entities = device_sensors(spc, spc.coordinator.index, config_entry)
 
-    for surepy_entity in spc.coordinator.data.values():
+    entities.append(SkippedUpdates(spc.coordinator, spc))
+    entities.append(UpdateInterval(spc.coordinator, spc))
+    entities.append(ApiRetries(spc.coordinator, spc))
+    entities.append(CircuitBreaker(spc.coordinator, spc))
+    entities.append(RefreshLatency(spc.coordinator, spc))
+    entities.append(PayloadSize(spc.coordinator, spc))
+    entities.append(RefreshFailures(spc.coordinator, spc))
 
-        if surepy_entity.type in [
-            EntityType.CAT_FLAP,
-            EntityType.PET_FLAP,
-        ] and surepy_entity.raw_data().get("status", {}).get("locking"):
-            entities.append(Flap(spc.coordinator, surepy_entity.id, spc))
+    async_add_entities(entities)
 
-        elif surepy_entity.type == EntityType.FELAQUA:
-            entities.append(Felaqua(spc.coordinator, surepy_entity.id, spc))
+    @callback
+    def async_add_paired() -> None:
+        """Add the sensors of pets and devices paired to the account."""
+        if spc.coordinator.added_ids:
+            async_add_entities(device_sensors(spc, spc.coordinator.added, config_entry))
 
-        elif surepy_entity.type == EntityType.FEEDER:
+    config_entry.async_on_unload(spc.coordinator.async_add_listener(async_add_paired))
 
-            bowls = {}
 
-            if len(surepy_entity.bowls) > 0:
-                bowls = surepy_entity.bowls.values()
-            else:
-                if surepy_entity.raw_data()["control"].get("bowls"):
-                    bowls = surepy_entity.raw_data()["control"]["bowls"]
+def device_sensors(
+    spc: SurePetcareAPI, index: EntityIndex, config_entry: ConfigEntry
+) -> list[SensorEntity]:
+    """Return the sensors of the pets and devices of an index."""
 
-            _LOGGER.debug(
-                "%s| bowls (%d): %s",
-                surepy_entity.raw_data()["name"],
-                len(bowls),
-                pprint.pformat(bowls),
-            )
+    entities: list[SensorEntity] = []
+
+    for flap_id in index.lockable_flaps:
+        entities.append(Flap(spc.coordinator, flap_id, spc))
+
+    for felaqua_id in index.felaquas:
+        entities.append(Felaqua(spc.coordinator, felaqua_id, spc))
+        entities.extend(consumption_sensors(spc.coordinator, felaqua_id, spc))
 
-            for bowl in bowls.get("settings", []):
-                entities.append(
-                    FeederBowl(spc.coordinator, surepy_entity.id, spc, bowl)
-                    # FeederBowl(spc.coordinator, surepy_entity.id, spc, bowl.raw_data())
-                )
+    for feeder_id in index.feeders:
 
-            entities.append(Feeder(spc.coordinator, surepy_entity.id, spc))
+        feeder = spc.coordinator.data[feeder_id]
+        bowls = feeder.raw_data().get("control", {}).get("bowls") or {}
 
-        if surepy_entity.type in [
-            EntityType.CAT_FLAP,
-            EntityType.PET_FLAP,
-            EntityType.FEEDER,
-            EntityType.FELAQUA,
-        ] and surepy_entity.raw_data().get("status", {}).get("battery", {}):
+        spc.tracer.trace(TRACE_ENTITIES, f"bowls of {feeder.name}", bowls)
 
-            voltage_batteries_full = cast(
-                float,
-                config_entry.options.get(ATTR_VOLTAGE_FULL, SURE_BATT_VOLTAGE_FULL),
+        # the order of the settings matches the index of the bowl weights
+        for bowl_index, bowl in enumerate(bowls.get("settings", [])):
+            entities.append(
+                FeederBowl(spc.coordinator, feeder_id, spc, bowl_index, bowl)
             )
-            voltage_batteries_low = cast(
-                float, config_entry.options.get(ATTR_VOLTAGE_LOW, SURE_BATT_VOLTAGE_LOW)
+            entities.extend(
+                consumption_sensors(spc.coordinator, feeder_id, spc, bowl_index)
             )
 
-            entities.append(
-                Battery(
-                    spc.coordinator,
-                    surepy_entity.id,
-                    spc,
-                    voltage_full=voltage_batteries_full,
-                    voltage_low=voltage_batteries_low,
-                )
+        entities.append(Feeder(spc.coordinator, feeder_id, spc))
+
+    for pet_id in index.pets:
+        entities.append(LocationDuration(spc.coordinator, pet_id, spc))
+        entities.append(TimeOutsideToday(spc.coordinator, pet_id, spc))
+        entities.append(VisitsToday(spc.coordinator, pet_id, spc))
+        entities.append(FoodEatenToday(spc.coordinator, pet_id, spc))
+        entities.append(WaterDrunkToday(spc.coordinator, pet_id, spc))
+
+    voltage_batteries_full = cast(
+        float,
+        config_entry.options.get(ATTR_VOLTAGE_FULL, SURE_BATT_VOLTAGE_FULL),
+    )
+    voltage_batteries_low = cast(
+        float, config_entry.options.get(ATTR_VOLTAGE_LOW, SURE_BATT_VOLTAGE_LOW)
+    )
+
+    for device_id in index.batteries:
+        entities.append(
+            Battery(
+                spc.coordinator,
+                device_id,
+                spc,
+                voltage_full=voltage_batteries_full,
+                voltage_low=voltage_batteries_low,
             )
+        )
+        entities.append(BatteryDaysRemaining(spc.coordinator, device_id, spc))
 
-    async_add_entities(entities)
+    return entities
 
 
 class SurePetcareSensor(CoordinatorEntity, SensorEntity):
@@ -138,7 +163,7 @@ class SurePetcareSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(self, coordinator, _id: int, spc: SurePetcareAPI):
         """Initialize a Sure Petcare sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=_id)
 
         self._id = _id
         self._spc: SurePetcareAPI = spc
@@ -146,60 +171,62 @@ class SurePetcareSensor(CoordinatorEntity, SensorEntity):
         self._coordinator = coordinator
 
         self._surepy_entity: SurepyEntity = self._coordinator.data[_id]
-        self._state: dict[str, Any] = self._surepy_entity.raw_data()["status"]
+        self._state: dict[str, Any] = (
+            self._surepy_entity.raw_data().get("status") or {}
+        )
+        self._view: EntityView = self._coordinator.views[_id]
 
         self._attr_available = bool(self._state)
         self._attr_unique_id = f"{self._surepy_entity.household_id}-{self._id}"
 
-        self._attr_extra_state_attributes = (
-            {**self._surepy_entity.raw_data()} if self._state else {}
-        )
-
         self._attr_name: str = (
             f"{self._surepy_entity.type.name.replace('_', ' ').title()} "
             f"{self._surepy_entity.name.capitalize()}"
         )
 
-    @property
-    def device_info(self):
+    def _attributes(self) -> dict[str, Any]:
+        """Return the state attributes provided by this entity itself."""
+        return {}
 
-        device = {}
+    def _build_attributes(self) -> dict[str, Any]:
+        """Build the state attributes for the configured attribute profile."""
 
-        try:
+        if not self._view.available:
+            return {}
 
-            model = f"{self._surepy_entity.type.name.replace('_', ' ').title()}"
-            if serial := self._surepy_entity.raw_data().get("serial_number"):
-                model = f"{model} ({serial})"
-            elif mac_address := self._surepy_entity.raw_data().get("mac_address"):
-                model = f"{model} ({mac_address})"
-            elif tag_id := self._surepy_entity.raw_data().get("tag_id"):
-                model = f"{model} ({tag_id})"
+        return {**self._attributes(), **self._view.attributes}
 
-            device = {
-                "identifiers": {(DOMAIN, self._id)},
-                "name": self._surepy_entity.name.capitalize(),
-                "manufacturer": SURE_MANUFACTURER,
-                "model": model,
-            }
+    def _update_from_view(self) -> None:
+        """Set the state and attributes from the view model."""
+        self._attr_extra_state_attributes = self._build_attributes()
 
-            if self._state:
-                versions = self._state.get("version", {})
+    async def async_added_to_hass(self) -> None:
+        """Set the initial state and attributes."""
+        self._update_from_view()
+        await super().async_added_to_hass()
 
-                if dev_fw_version := versions.get("device", {}).get("firmware"):
-                    device["sw_version"] = dev_fw_version
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state and attributes from the new view model."""
 
-                if (lcd_version := versions.get("lcd", {})) and (
-                    rf_version := versions.get("rf", {})
-                ):
-                    device["sw_version"] = (
-                        f"lcd: {lcd_version.get('version', lcd_version)['firmware']} | "
-                        f"fw: {rf_version.get('version', rf_version)['firmware']}"
-                    )
+        # the id of a feeder bowl is not the id of its feeder
+        if self._surepy_entity.id in self._coordinator.removed_ids:
+            async_remove_entity(self)
+            return
 
-        except AttributeError:
-            pass
+        # the coordinator context is always the id of the surepy entity
+        if surepy_entity := self._coordinator.data.get(self.coordinator_context):
+            self._surepy_entity = surepy_entity
+            self._view = self._coordinator.views[self.coordinator_context]
 
-        return device
+        self._update_from_view()
+
+        super()._handle_coordinator_update()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device registry record shared by the entities of the device."""
+        return self._spc.devices.get(self._id, self._surepy_entity)
 
 
 class Flap(SurePetcareSensor):
@@ -211,26 +238,15 @@ class Flap(SurePetcareSensor):
         self._surepy_entity: SureFlap
 
         self._attr_entity_picture = self._surepy_entity.icon
-        self._attr_unit_of_measurement = None
 
-        if self._state:
-            self._attr_extra_state_attributes = {
-                "learn_mode": bool(self._state["learn_mode"]),
-                **self._surepy_entity.raw_data(),
-            }
+    def _attributes(self) -> dict[str, Any]:
+        """Return the learn mode of the flap."""
+        return {"learn_mode": bool(self._view.learn_mode)}
 
-            if locking := self._state.get("locking"):
-                self._attr_state = LockState(locking["mode"]).name.casefold()
-
-    @property
-    def state(self) -> str | None:
-        """Return battery level in percent."""
-        if (
-            state := cast(SureFlap, self._coordinator.data[self._id])
-            .raw_data()
-            .get("status")
-        ):
-            return LockState(state["locking"]["mode"]).name.casefold()
+    def _update_from_view(self) -> None:
+        """Set the lock state."""
+        self._attr_native_value = self._view.lock_state
+        super()._update_from_view()
 
 
 class Felaqua(SurePetcareSensor):
@@ -242,13 +258,12 @@ class Felaqua(SurePetcareSensor):
         self._surepy_entity: SureFelaqua
 
         self._attr_entity_picture = self._surepy_entity.icon
-        self._attr_unit_of_measurement = UnitOfVolume.MILLILITERS
+        self._attr_native_unit_of_measurement = UnitOfVolume.MILLILITERS
 
-    @property
-    def state(self) -> float | None:
-        """Return the remaining water."""
-        if felaqua := cast(SureFelaqua, self._coordinator.data[self._id]):
-            return int(felaqua.water_remaining) if felaqua.water_remaining else None
+    def _update_from_view(self) -> None:
+        """Set the remaining water."""
+        self._attr_native_value = self._view.water_remaining
+        super()._update_from_view()
 
 
 class FeederBowl(SurePetcareSensor):
@@ -259,20 +274,18 @@ class FeederBowl(SurePetcareSensor):
         coordinator,
         _id: int,
         spc: SurePetcareAPI,
+        bowl_index: int,
         bowl_data: dict[str, int | str],
     ):
         """Initialize a Bowl sensor."""
         super().__init__(coordinator, _id, spc)
 
-        _LOGGER.debug("bowl_data: %s", pprint.pformat(bowl_data))
+        spc.tracer.trace(TRACE_ENTITIES, "bowl data", bowl_data)
 
         self.feeder_id = _id
 
-        # todo: index parameter is not available in the bowl_data anymore
-        # for now we use a random number...
-        self.bowl_id = random.randint(
-            1, 10
-        )  # int(bowl_data.get("index", random.randint(1, 10)))
+        # position of the bowl in the feeder settings, 0 is the left bowl
+        self.bowl_id = bowl_index
 
         self._id = int(f"{_id}{str(self.bowl_id)}")
         self._spc: SurePetcareAPI = spc
@@ -290,31 +303,15 @@ class FeederBowl(SurePetcareSensor):
 
         self._attr_icon = "mdi:bowl"
 
-        if hasattr(self._surepy_entity, "weight"):
-            self._attr_state = int(self._surepy_entity.weight)
-
         self._attr_unique_id = (
             f"{self._surepy_feeder_entity.household_id}-{self.feeder_id}-{self.bowl_id}"
         )
-        self._attr_unit_of_measurement = UnitOfMass.GRAMS
-
-    @property
-    def state(self) -> float | None:
-        """Return the remaining water."""
+        self._attr_native_unit_of_measurement = UnitOfMass.GRAMS
 
-        _LOGGER.debug(
-            "self._coordinator.data[%d]: %s",
-            self.feeder_id,
-            pprint.pformat(self._coordinator.data[self.feeder_id]),
-        )
-
-        if (
-            (feeder := cast(SureFeeder, self._coordinator.data[self.feeder_id]))
-            and len(feeder.bowls) > 0
-            and hasattr(feeder.bowls[self.bowl_id], "weight")
-            and (weight := feeder.bowls[self.bowl_id].weight)
-        ):
-            return int(weight) if weight and weight > 0 else None
+    def _update_from_view(self) -> None:
+        """Set the remaining food in the bowl."""
+        self._attr_native_value = self._view.bowl_weights.get(self.bowl_id)
+        super()._update_from_view()
 
 
 class Feeder(SurePetcareSensor):
@@ -326,13 +323,12 @@ class Feeder(SurePetcareSensor):
         self._surepy_entity: SureFeeder
 
         self._attr_entity_picture = self._surepy_entity.icon
-        self._attr_unit_of_measurement = UnitOfMass.GRAMS
+        self._attr_native_unit_of_measurement = UnitOfMass.GRAMS
 
-    @property
-    def state(self) -> float | None:
-        """Return the total remaining food."""
-        if feeder := cast(SureFeeder, self._coordinator.data[self._id]):
-            return int(feeder.total_weight) if feeder.total_weight else None
+    def _update_from_view(self) -> None:
+        """Set the total remaining food."""
+        self._attr_native_value = self._view.total_weight
+        super()._update_from_view()
 
 
 class Battery(SurePetcareSensor):
@@ -355,62 +351,531 @@ class Battery(SurePetcareSensor):
         self.voltage_low = voltage_low
         self.voltage_full = voltage_full
 
-        self._attr_unit_of_measurement = PERCENTAGE
+        self._attr_native_unit_of_measurement = PERCENTAGE
         self._attr_device_class = SensorDeviceClass.BATTERY
         self._attr_unique_id = (
             f"{self._surepy_entity.household_id}-{self._surepy_entity.id}-battery"
         )
 
-    @property
-    def state(self) -> int | None:
-        """Return battery level in percent."""
+    def _update_from_view(self) -> None:
+        """Set the smoothed battery level in percent."""
 
-        if battery := cast(SurepyDevice, self._coordinator.data[self._id]):
+        level = self._spc.battery.level(self._id)
+        self._attr_native_value = self._view.battery_level if level is None else level
 
-            self._surepy_entity = battery
-            self.device_class = SensorDeviceClass.BATTERY
-            self.native_unit_of_measurement = PERCENTAGE
-            battery_level = battery.calculate_battery_level(
-                voltage_full=self.voltage_full, voltage_low=self.voltage_low
-            )
-
-            # return batterie level between 0 and 100
-            return battery_level
+        super()._update_from_view()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the additional attrs."""
+    def _attributes(self) -> dict[str, Any]:
+        """Return the battery voltages."""
 
         attrs = {}
 
-        if (device:= cast(SurepyDevice, self._coordinator.data[self._id])) and (
-            state:= device.raw_data().get("status")
-        ):
-            self._surepy_entity = device
-
-            voltage = float(state["battery"])
-
+        if (device := cast(SurepyDevice, self._surepy_entity)) and (
+            voltage := self._view.voltage
+        ) is not None:
             attrs = {
                 "battery_level": device.battery_level,
                 ATTR_VOLTAGE: f"{voltage:.2f}",
                 f"{ATTR_VOLTAGE}_per_battery": f"{voltage / 4:.2f}",
-                **self._surepy_entity.raw_data() # include all data
             }
 
-            if hasattr(device, "location") and hasattr(device.location, "since"):
-                since_dt = datetime.fromisoformat(device.location.since.replace("Z", "+00:00"))
-                now_dt = datetime.now(timezone.utc)
-                duration = now_dt - since_dt
+        if state := self._spc.battery.states.get(self._id):
+            attrs[f"{ATTR_VOLTAGE}_smoothed"] = f"{state.voltage:.2f}"
+
+        return attrs
 
-                days, remainder = divmod(int(duration.total_seconds()), 86400)  # Calculate days
-                hours, remainder = divmod(remainder, 3600)
-                minutes, _ = divmod(remainder, 60)
 
-                if days > 0:
-                    formatted_duration = f"{days}d {hours:02}:{minutes:02}"  # Format with days
-                else:
-                    formatted_duration = f"{hours:02}:{minutes:02}"
+class BatteryDaysRemaining(SurePetcareSensor):
+    """Forecast days until the batteries of a device are low."""
 
-                attrs["for"] = formatted_duration
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.DAYS
+    _attr_icon = "mdi:battery-clock-outline"
 
-        return attrs
+    def __init__(self, coordinator, _id: int, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, _id, spc)
+
+        self._attr_name = f"{self._attr_name} Battery Days Remaining"
+        self._attr_unique_id = (
+            f"{self._surepy_entity.household_id}-{self._id}-battery-days"
+        )
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return the discharge slope."""
+
+        if not (state := self._spc.battery.states.get(self._id)):
+            return {}
+
+        return {"volts_per_day": round(state.slope, 4)}
+
+    def _update_from_view(self) -> None:
+        """Set the forecast days remaining."""
+
+        days = self._spc.battery.days_remaining(self._id)
+        self._attr_native_value = None if days is None else round(days)
+
+        super()._update_from_view()
+
+
+class LocationDuration(SurePetcareSensor):
+    """Time since a pet changed its location."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator, _id: int, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, _id, spc)
+
+        self._attr_name = f"{self._attr_name} Location Duration"
+        self._attr_unique_id = f"{self._surepy_entity.household_id}-{self._id}-since"
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return the time of the last location change."""
+        return {"since": self._view.since} if self._view.since else {}
+
+    def _update_from_view(self) -> None:
+        """Set the seconds since the last location change."""
+
+        duration = duration_since(self._view.since_dt)
+        self._attr_native_value = int(duration.total_seconds()) if duration else None
+
+        super()._update_from_view()
+
+    async def async_added_to_hass(self) -> None:
+        """Update the duration every minute."""
+        self.async_on_remove(
+            self._spc.since_ticker.async_add_listener(self._handle_minute)
+        )
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_minute(self) -> None:
+        """Update the seconds since the last location change."""
+        self._update_from_view()
+        self.async_write_ha_state()
+
+
+class PetHistorySensor(SurePetcareSensor):
+    """Aggregate of the recorded events of a pet for today."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self, coordinator, _id: int, spc: SurePetcareAPI, name: str, key: str
+    ) -> None:
+        super().__init__(coordinator, _id, spc)
+
+        self._attr_name = f"{self._attr_name} {name}"
+        self._attr_unique_id = f"{self._surepy_entity.household_id}-{self._id}-{key}"
+
+    def _value(self, day: PetDay) -> float | int | None:
+        """Return the aggregate shown by this sensor."""
+        raise NotImplementedError
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return no attributes, they are part of the pet entities."""
+        return {}
+
+    def _update_from_view(self) -> None:
+        """Set the aggregate of today."""
+        self._attr_native_value = self._value(self._spc.history.today(self._id))
+        super()._update_from_view()
+
+    async def async_added_to_hass(self) -> None:
+        """Update the aggregate when new events were recorded."""
+        self.async_on_remove(
+            self._spc.history.async_add_listener(self._id, self._handle_history)
+        )
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_history(self) -> None:
+        """Update the aggregate of today."""
+        self._update_from_view()
+        self.async_write_ha_state()
+
+
+class TimeOutsideToday(PetHistorySensor):
+    """Time a pet spent outside today."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:tree-outline"
+
+    def __init__(self, coordinator, _id: int, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, _id, spc, "Time Outside Today", "outside-today")
+
+    def _value(self, day: PetDay) -> int:
+        """Return the seconds spent outside today."""
+        return round(day.time_outside_until(dt_util.utcnow().timestamp()))
+
+    async def async_added_to_hass(self) -> None:
+        """Update the time of the current visit every minute."""
+        self.async_on_remove(
+            self._spc.since_ticker.async_add_listener(self._handle_history)
+        )
+        await super().async_added_to_hass()
+
+
+class VisitsToday(PetHistorySensor):
+    """Number of times a pet went outside today."""
+
+    _attr_icon = "mdi:door-open"
+
+    def __init__(self, coordinator, _id: int, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, _id, spc, "Visits Today", "visits-today")
+
+    def _value(self, day: PetDay) -> int:
+        """Return the number of visits outside today."""
+        return day.visits
+
+
+class FoodEatenToday(PetHistorySensor):
+    """Food a pet ate today."""
+
+    # the weight device class does not allow a total
+    _attr_native_unit_of_measurement = UnitOfMass.GRAMS
+    _attr_icon = "mdi:food-drumstick-outline"
+
+    def __init__(self, coordinator, _id: int, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, _id, spc, "Food Eaten Today", "food-today")
+
+    def _value(self, day: PetDay) -> float:
+        """Return the grams eaten today."""
+        return round(day.food_eaten, 1)
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return the meals of today."""
+
+        day = self._spc.history.today(self._id)
+
+        return {
+            "meals": day.meals,
+            "last_meal": day.last_meal,
+            "grams_per_meal": (
+                round(day.food_eaten / day.meals, 1) if day.meals else None
+            ),
+        }
+
+
+class WaterDrunkToday(PetHistorySensor):
+    """Water a pet drank today."""
+
+    _attr_device_class = SensorDeviceClass.VOLUME
+    _attr_native_unit_of_measurement = UnitOfVolume.MILLILITERS
+    _attr_icon = "mdi:cup-water"
+
+    def __init__(self, coordinator, _id: int, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, _id, spc, "Water Drunk Today", "water-today")
+
+    def _value(self, day: PetDay) -> float:
+        """Return the milliliters drunk today."""
+        return round(day.water_drunk, 1)
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return the number of drinks today."""
+        return {"drinks": self._spc.history.today(self._id).drinks}
+
+
+def consumption_sensors(
+    coordinator, _id: int, spc: SurePetcareAPI, bowl: int | None = None
+) -> list[SensorEntity]:
+    """Return the consumption sensors of a feeder bowl or felaqua."""
+    return [
+        sensor_class(coordinator, _id, spc, bowl)
+        for sensor_class in [ConsumptionRate, IntakeToday, LastRefill, TimeUntilEmpty]
+    ]
+
+
+class ConsumptionSensor(SurePetcareSensor):
+    """Consumption of a feeder bowl or felaqua."""
+
+    def __init__(
+        self,
+        coordinator,
+        _id: int,
+        spc: SurePetcareAPI,
+        bowl: int | None,
+        name: str,
+        key: str,
+    ) -> None:
+        super().__init__(coordinator, _id, spc)
+
+        # the rate changes over time, update with every poll and not only
+        # after the level changed
+        self.coordinator_context = None
+
+        # index of the feeder bowl, None for a felaqua
+        self._bowl = bowl
+        self._unit = UnitOfVolume.MILLILITERS if bowl is None else UnitOfMass.GRAMS
+
+        if bowl is None:
+            self._attr_name = f"{self._attr_name} {name}"
+            self._attr_unique_id = (
+                f"{self._surepy_entity.household_id}-{self._id}-{key}"
+            )
+        else:
+            self._attr_name = f"{self._attr_name} Bowl {bowl + 1} {name}"
+            self._attr_unique_id = (
+                f"{self._surepy_entity.household_id}-{self._id}-{bowl}-{key}"
+            )
+
+    def _value(self, window: ConsumptionWindow) -> Any:
+        """Return the value shown by this sensor."""
+        raise NotImplementedError
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return no attributes, they are part of the device entities."""
+        return {}
+
+    def _update_from_view(self) -> None:
+        """Set the value from the consumption window."""
+        self._attr_native_value = self._value(
+            self._spc.consumption.get(self._id, self._bowl)
+        )
+        super()._update_from_view()
+
+
+class ConsumptionRate(ConsumptionSensor):
+    """Average consumption per hour over the last 24 hours."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:speedometer"
+
+    def __init__(
+        self, coordinator, _id: int, spc: SurePetcareAPI, bowl: int | None
+    ) -> None:
+        super().__init__(coordinator, _id, spc, bowl, "Consumption Rate", "rate")
+        self._attr_native_unit_of_measurement = f"{self._unit}/{UnitOfTime.HOURS}"
+
+    def _value(self, window: ConsumptionWindow) -> float | None:
+        """Return the consumption per hour."""
+        return None if (rate := window.rate) is None else round(rate, 1)
+
+
+class IntakeToday(ConsumptionSensor):
+    """Food or water consumed today."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:silverware-fork-knife"
+
+    def __init__(
+        self, coordinator, _id: int, spc: SurePetcareAPI, bowl: int | None
+    ) -> None:
+        super().__init__(coordinator, _id, spc, bowl, "Intake Today", "intake-today")
+        self._attr_native_unit_of_measurement = self._unit
+
+        # the weight device class does not allow a total
+        if bowl is None:
+            self._attr_device_class = SensorDeviceClass.VOLUME
+            self._attr_icon = "mdi:water-outline"
+
+    def _value(self, window: ConsumptionWindow) -> float:
+        """Return the grams or milliliters consumed today."""
+        return round(window.intake_today, 1)
+
+
+class LastRefill(ConsumptionSensor):
+    """Time of the last refill."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:cup-water"
+
+    def __init__(
+        self, coordinator, _id: int, spc: SurePetcareAPI, bowl: int | None
+    ) -> None:
+        super().__init__(coordinator, _id, spc, bowl, "Last Refill", "refill")
+
+    def _value(self, window: ConsumptionWindow) -> datetime | None:
+        """Return the time of the last refill."""
+        return window.last_refill
+
+    def _build_attributes(self) -> dict[str, Any]:
+        """Return the number of refills today."""
+
+        window = self._spc.consumption.get(self._id, self._bowl)
+
+        return {"refills_today": window.refills_today}
+
+
+class TimeUntilEmpty(ConsumptionSensor):
+    """Predicted time until empty at the current consumption rate."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(
+        self, coordinator, _id: int, spc: SurePetcareAPI, bowl: int | None
+    ) -> None:
+        super().__init__(coordinator, _id, spc, bowl, "Time Until Empty", "empty-in")
+
+    def _value(self, window: ConsumptionWindow) -> float | None:
+        """Return the hours until empty."""
+        hours = window.hours_until_empty
+        return None if hours is None else round(hours, 1)
+
+
+class SureHADiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor about the integration itself."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, spc: SurePetcareAPI, name: str, key: str) -> None:
+        """Initialize a SureHA diagnostic sensor."""
+        super().__init__(coordinator)
+
+        self._spc: SurePetcareAPI = spc
+
+        self._attr_name = f"SureHA {name}"
+        self._attr_unique_id = f"{spc.config_entry.entry_id}-{key}"
+
+
+class SkippedUpdates(SureHADiagnosticSensor):
+    """Number of entity updates skipped because their data did not change."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:database-off-outline"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "Skipped Updates", "skipped-updates")
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of skipped entity updates."""
+        return int(self.coordinator.skipped_updates)
+
+
+class UpdateInterval(SureHADiagnosticSensor):
+    """Current interval of the adaptive polling."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-sync-outline"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "Update Interval", "update-interval")
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the current update interval in seconds."""
+
+        if interval := self.coordinator.update_interval:
+            return int(interval.total_seconds())
+
+        return None
+
+
+class ApiRetries(SureHADiagnosticSensor):
+    """Number of api calls retried after a transient error."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:reload-alert"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "API Retries", "api-retries")
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of retried api calls."""
+        return int(self._spc.client.retries)
+
+
+class CircuitBreaker(SureHADiagnosticSensor):
+    """State of the circuit breaker suspending calls to a failing api."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = ["closed", "open"]
+    _attr_icon = "mdi:electric-switch"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "Circuit Breaker", "circuit-breaker")
+
+    @property
+    def native_value(self) -> str:
+        """Return the state of the circuit breaker."""
+        return "open" if self._spc.client.is_open else "closed"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of times the breaker opened."""
+        return {"trips": self._spc.client.breaker_trips}
+
+
+class RefreshLatency(SureHADiagnosticSensor):
+    """Duration of the last refresh."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "Refresh Latency", "refresh-latency")
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last refresh."""
+        return self.coordinator.metrics.latency_last
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the latency statistics."""
+        return self.coordinator.metrics.as_dict()["latency"]
+
+
+class PayloadSize(SureHADiagnosticSensor):
+    """Size of the data of the last refresh."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:download-network-outline"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "Payload Size", "payload-size")
+
+    @property
+    def native_value(self) -> int:
+        """Return the size of the data of the last refresh."""
+        return self.coordinator.metrics.payload_bytes
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of entities and state writes."""
+
+        metrics = self.coordinator.metrics
+
+        return {
+            "entities": metrics.entities,
+            "changed_entities": metrics.changed_entities,
+            "state_writes": metrics.state_writes,
+        }
+
+
+class RefreshFailures(SureHADiagnosticSensor):
+    """Number of failed refreshes."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:sync-alert"
+
+    def __init__(self, coordinator, spc: SurePetcareAPI) -> None:
+        super().__init__(coordinator, spc, "Refresh Failures", "refresh-failures")
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of failed refreshes."""
+        return self.coordinator.metrics.failures
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of refreshes."""
+        return {"refreshes": self.coordinator.metrics.refreshes}
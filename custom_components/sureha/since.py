@@ -0,0 +1,80 @@
+"""Time since a pet changed its location."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+import homeassistant.util.dt as dt_util
+
+
+def parse_since(since: Any) -> datetime | None:
+    """Parse a timestamp of the api."""
+
+    if isinstance(since, datetime):
+        return since
+
+    return dt_util.parse_datetime(str(since)) if since else None
+
+
+def duration_since(since: datetime | None) -> timedelta | None:
+    """Return the time passed since a parsed timestamp."""
+    return dt_util.utcnow() - since if since else None
+
+
+def format_duration(duration: timedelta) -> str:
+    """Format a duration like 1d 02:03 or 02:03."""
+
+    days, remainder = divmod(max(int(duration.total_seconds()), 0), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, _ = divmod(remainder, 60)
+
+    if days > 0:
+        return f"{days}d {hours:02}:{minutes:02}"
+
+    return f"{hours:02}:{minutes:02}"
+
+
+class SinceTicker:
+    """Notify everything that shows the time since a location change.
+
+    A single timer fires at the start of every minute while at least one
+    listener is registered, instead of every entity tracking the time itself.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the ticker."""
+
+        self.hass = hass
+
+        self._listeners: dict[CALLBACK_TYPE, None] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call ``update_callback`` every minute, return a function to stop."""
+
+        self._listeners[update_callback] = None
+
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_utc_time_change(
+                self.hass, self._async_tick, second=0
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(update_callback, None)
+
+            if not self._listeners and self._unsub_timer:
+                self._unsub_timer()
+                self._unsub_timer = None
+
+        return remove_listener
+
+    @callback
+    def _async_tick(self, _: datetime) -> None:
+        """Notify all listeners."""
+
+        for update_callback in list(self._listeners):
+            update_callback()
@@ -0,0 +1,90 @@
+"""Local snapshot of the Sure Petcare data for a fast startup."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from surepy.entities import SurepyEntity
+from surepy.entities.devices import Feeder, Felaqua, Flap, Hub
+from surepy.entities.pet import Pet
+from surepy.enums import EntityType
+
+# pylint: disable=relative-beyond-top-level
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# seconds to wait before writing a changed snapshot
+SAVE_DELAY = 60
+
+ENTITY_CLASSES: dict[EntityType, type[SurepyEntity]] = {
+    EntityType.PET: Pet,
+    EntityType.HUB: Hub,
+    EntityType.CAT_FLAP: Flap,
+    EntityType.PET_FLAP: Flap,
+    EntityType.FEEDER: Feeder,
+    EntityType.FEEDER_LITE: Feeder,
+    EntityType.FELAQUA: Felaqua,
+}
+
+
+def entities_from_raw_data(
+    raw_entities: list[dict[str, Any]]
+) -> dict[int, SurepyEntity]:
+    """Create surepy entities from their raw api data, like surepy does."""
+
+    surepy_entities: dict[int, SurepyEntity] = {}
+
+    for raw_data in raw_entities:
+        entity_type = EntityType(int(raw_data.get("product_id", 0)))
+
+        if entity_class := ENTITY_CLASSES.get(entity_type):
+            surepy_entity = entity_class(data=raw_data)
+            surepy_entities[surepy_entity.id] = surepy_entity
+
+    return surepy_entities
+
+
+class SnapshotStore:
+    """Persist the last successfully fetched surepy entities."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot store."""
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot", private=True
+        )
+        self._raw_entities: list[dict[str, Any]] = []
+
+    async def async_load(self) -> dict[int, SurepyEntity] | None:
+        """Return the surepy entities of the last snapshot."""
+
+        if not (snapshot := await self._store.async_load()):
+            return None
+
+        try:
+            return entities_from_raw_data(snapshot["entities"]) or None
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning("🐾 ignoring invalid snapshot: %s", error)
+            return None
+
+    @callback
+    def async_save(self, surepy_entities: dict[int, SurepyEntity]) -> None:
+        """Schedule writing a new snapshot."""
+
+        self._raw_entities = [
+            surepy_entity.raw_data() for surepy_entity in surepy_entities.values()
+        ]
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data of the snapshot."""
+        return {"entities": self._raw_entities}
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot."""
+        await self._store.async_remove()
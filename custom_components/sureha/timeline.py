@@ -0,0 +1,202 @@
+"""Incremental updates based on the Sure Petcare household timeline."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import monotonic
+
+from surepy import Surepy
+from surepy.const import MESTART_RESOURCE
+from surepy.entities import SurepyEntity
+from surepy.exceptions import (
+    SurePetcareAuthenticationError,
+    SurePetcareConnectionError,
+    SurePetcareError,
+)
+
+# pylint: disable=relative-beyond-top-level
+from .const import SURE_MAX_PARALLEL_TIMELINES
+
+_LOGGER = logging.getLogger(__name__)
+
+# errors of a timeline poll that do not fail the update
+TIMELINE_ERRORS = (SurePetcareError, KeyError, TypeError, ValueError)
+
+
+class TimelineUpdater:
+    """Fetch the surepy entities only if something happened in a household.
+
+    Every movement, feeding, drinking or lock state change creates an entry in
+    the household timeline. The id of the newest entry of each household is
+    kept as cursor and the first timeline page is polled instead of all
+    households, devices and pets. The entities are only fetched again if a
+    cursor moved, a cursor got lost, a full refresh was requested or the
+    last full refresh is older than ``full_refresh_interval`` seconds.
+
+    The timelines of the households are polled concurrently. The entities of
+    all households come with a single request, so a failing timeline falls
+    back to a full refresh instead of missing the events of its household.
+    """
+
+    def __init__(
+        self, surepy: Surepy, incremental: bool, full_refresh_interval: int
+    ) -> None:
+        """Initialize the updater."""
+
+        self.surepy = surepy
+        self.incremental = incremental
+        self.full_refresh_interval = full_refresh_interval
+
+        self._cursors: dict[int, int | None] = {}
+        self._entities: dict[int, SurepyEntity] = {}
+        self._last_full_refresh: float = 0.0
+        self._full_refresh_requested: bool = True
+
+        # number of polls answered from the cache and with a full refresh
+        self.incremental_updates: int = 0
+        self.full_updates: int = 0
+        # failed timeline polls by household id
+        self.timeline_failures: dict[int, int] = {}
+
+    def request_full_refresh(self) -> None:
+        """Fetch all entities on the next update."""
+        self._full_refresh_requested = True
+
+    async def _async_latest_event(self, household_id: int) -> int | None:
+        """Return the id of the newest timeline entry of a household."""
+
+        timeline = await self.surepy.get_household_timeline(household_id, entries=1)
+
+        return max(
+            (int(entry["id"]) for entry in timeline if "id" in entry), default=None
+        )
+
+    async def _async_cursors(self) -> dict[int, int | None]:
+        """Return the current cursor of every known household."""
+
+        household_ids = sorted(
+            {entity.household_id for entity in self._entities.values()}
+        )
+        semaphore = asyncio.Semaphore(SURE_MAX_PARALLEL_TIMELINES)
+
+        async def latest_event(household_id: int) -> int | None:
+            async with semaphore:
+                return await self._async_latest_event(household_id)
+
+        results = await asyncio.gather(
+            *(latest_event(household_id) for household_id in household_ids),
+            return_exceptions=True,
+        )
+
+        cursors: dict[int, int | None] = {}
+        failed = 0
+
+        for household_id, result in zip(household_ids, results):
+
+            if isinstance(result, SurePetcareAuthenticationError):
+                raise result
+
+            if isinstance(result, TIMELINE_ERRORS):
+                _LOGGER.debug(
+                    "🐾 could not fetch the timeline of household %s: %s",
+                    household_id,
+                    result,
+                )
+                failed += 1
+                self.timeline_failures[household_id] = (
+                    self.timeline_failures.get(household_id, 0) + 1
+                )
+
+            elif isinstance(result, BaseException):
+                raise result
+
+            else:
+                cursors[household_id] = result
+
+        if failed:
+            raise SurePetcareError(
+                f"{failed} of {len(household_ids)} household timelines unavailable"
+            )
+
+        return cursors
+
+    async def _async_try_cursors(self) -> dict[int, int | None]:
+        """Return the current cursors or an empty dict if they are unavailable."""
+
+        try:
+            return await self._async_cursors()
+        except SurePetcareAuthenticationError:
+            raise
+        except TIMELINE_ERRORS as error:
+            _LOGGER.debug("🐾 could not fetch household timelines: %s", error)
+            return {}
+
+    def _account_ids(self) -> set[int] | None:
+        """Return the ids of the pets and devices of the latest /me/start response."""
+
+        response = self.surepy.sac.resources.get(MESTART_RESOURCE) or {}
+
+        if not (data := response.get("data")):
+            return None
+
+        return {
+            int(raw_entity["id"])
+            for raw_entity in data.get("devices", []) + data.get("pets", [])
+        }
+
+    async def _async_full_refresh(self) -> dict[int, SurepyEntity]:
+        """Fetch all entities and move the cursors to the newest events."""
+
+        # fetch the cursors first to not miss events created during the refresh
+        cursors = (
+            await self._async_try_cursors()
+            if self.incremental and self._entities
+            else {}
+        )
+
+        # surepy logs but does not raise rate limits and server errors, they
+        # are retried like a connection error
+        if not (entities := await self.surepy.get_entities(refresh=True)):
+            raise SurePetcareConnectionError("could not fetch any pets or devices")
+
+        # surepy returns its own dict of entities and never removes the pets
+        # and devices removed from the account, only the latest response
+        # tells which ones are left
+        if (account_ids := self._account_ids()) is not None:
+            for entity_id in entities.keys() - account_ids:
+                del entities[entity_id]
+
+        # a dict of our own, surepy updates its dict on the next fetch
+        self._entities = dict(entities)
+        self._last_full_refresh = monotonic()
+        self._full_refresh_requested = False
+        self.full_updates += 1
+
+        if self.incremental and not cursors:
+            cursors = await self._async_try_cursors()
+
+        self._cursors = cursors
+
+        return self._entities
+
+    async def async_get_entities(self) -> dict[int, SurepyEntity]:
+        """Return the surepy entities, fetching them only if needed."""
+
+        if (
+            not self.incremental
+            or not self._entities
+            or self._full_refresh_requested
+            or not self._cursors
+            or monotonic() - self._last_full_refresh > self.full_refresh_interval
+        ):
+            return await self._async_full_refresh()
+
+        cursors = await self._async_try_cursors()
+
+        if not cursors or cursors != self._cursors:
+            _LOGGER.debug("🐾 new timeline events: %s -> %s", self._cursors, cursors)
+            return await self._async_full_refresh()
+
+        self.incremental_updates += 1
+
+        return self._entities
@@ -0,0 +1,89 @@
+"""Lazy debug tracing of the Sure Petcare payloads."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from copy import deepcopy
+import logging
+from pprint import pformat
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+
+# pylint: disable=relative-beyond-top-level
+from .const import SURE_TRACE_BUFFER
+
+_LOGGER = logging.getLogger(__name__)
+
+# subsystems, enabled by setting the log level of
+# custom_components.sureha.trace.<subsystem> to debug
+TRACE_API = "api"
+TRACE_ENTITIES = "entities"
+TRACE_SERVICES = "services"
+
+
+class LazyFormat:
+    """Pretty print an object only when the log record is formatted."""
+
+    __slots__ = ("_payload",)
+
+    def __init__(self, payload: Any) -> None:
+        """Initialize the wrapper."""
+        self._payload = payload
+
+    def __str__(self) -> str:
+        """Return the pretty printed payload."""
+        return pformat(self._payload)
+
+
+class Tracer:
+    """Log payloads per subsystem and keep the most recent ones.
+
+    Nothing is evaluated or formatted unless the logger of the subsystem is
+    enabled for debug messages. Payloads can be passed as a callable to also
+    defer building them. Traced payloads are kept in a ring buffer that is
+    part of the diagnostics.
+    """
+
+    def __init__(self, maxlen: int = SURE_TRACE_BUFFER) -> None:
+        """Initialize the tracer."""
+
+        self._loggers: dict[str, logging.Logger] = {}
+        self.buffer: deque[dict[str, Any]] = deque(maxlen=maxlen)
+
+    def _logger(self, subsystem: str) -> logging.Logger:
+        """Return the logger of a subsystem."""
+
+        if (logger := self._loggers.get(subsystem)) is None:
+            logger = self._loggers[subsystem] = _LOGGER.getChild(subsystem)
+
+        return logger
+
+    def enabled(self, subsystem: str) -> bool:
+        """Return True if tracing is enabled for a subsystem."""
+        return self._logger(subsystem).isEnabledFor(logging.DEBUG)
+
+    def trace(
+        self,
+        subsystem: str,
+        message: str,
+        payload: Any | Callable[[], Any] = None,
+    ) -> None:
+        """Trace a payload if tracing is enabled for the subsystem."""
+
+        if not self.enabled(subsystem):
+            return
+
+        # the buffer keeps a copy, the api data is modified in place
+        payload = deepcopy(payload() if callable(payload) else payload)
+
+        self.buffer.append(
+            {
+                "time": dt_util.utcnow().isoformat(),
+                "subsystem": subsystem,
+                "message": message,
+                "payload": payload,
+            }
+        )
+
+        self._logger(subsystem).debug("🐾 %s: %s", message, LazyFormat(payload))
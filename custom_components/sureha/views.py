@@ -0,0 +1,131 @@
+"""View models of the Sure Petcare pets and devices."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+from surepy.entities import SurepyEntity
+from surepy.enums import EntityType, LockState, Location
+
+# pylint: disable=relative-beyond-top-level
+from .attributes import profile_attributes
+from .const import SURE_BATT_VOLTAGE_FULL, SURE_BATT_VOLTAGE_LOW
+from .since import parse_since
+
+
+@dataclass(frozen=True, slots=True)
+class EntityView:
+    """Everything the entities of a pet or device show, built once per update.
+
+    Fields that do not apply to the type of the pet or device are None.
+    """
+
+    id: int
+    household_id: int
+    name: str
+    available: bool
+    online: bool
+    attributes: Mapping[str, Any]
+
+    # flaps
+    lock_state: str | None = None
+    learn_mode: bool | None = None
+
+    # battery powered devices
+    battery_level: int | None = None
+    voltage: float | None = None
+    device_rssi: float | None = None
+    hub_rssi: float | None = None
+
+    # hub
+    led_mode: int | None = None
+    pairing_mode: bool | None = None
+
+    # felaqua & feeder
+    water_remaining: int | None = None
+    total_weight: int | None = None
+    bowl_weights: Mapping[int, int] = field(default_factory=dict)
+
+    # pets
+    inside: bool | None = None
+    where: Location | None = None
+    since: str | None = None
+    since_dt: datetime | None = None
+
+
+def build_view(
+    surepy_entity: SurepyEntity,
+    attribute_profile: str,
+    voltage_full: float = SURE_BATT_VOLTAGE_FULL,
+    voltage_low: float = SURE_BATT_VOLTAGE_LOW,
+) -> EntityView:
+    """Build the view model of a pet or device from its surepy entity."""
+
+    raw_data = surepy_entity.raw_data()
+    status: dict[str, Any] = raw_data.get("status") or {}
+    signal: dict[str, Any] = status.get("signal") or {}
+
+    values: dict[str, Any] = {}
+
+    if surepy_entity.type == EntityType.PET:
+        location = surepy_entity.location
+        values = {
+            "inside": location.where == Location.INSIDE,
+            "where": location.where,
+            "since": location.since,
+            "since_dt": parse_since(location.since),
+        }
+
+    elif surepy_entity.type == EntityType.HUB:
+        values = {
+            "led_mode": int(status.get("led_mode", 0)),
+            "pairing_mode": bool(status.get("pairing_mode")),
+        }
+
+    else:
+        if (voltage := status.get("battery")) is not None:
+            values["voltage"] = float(voltage)
+            values["battery_level"] = surepy_entity.calculate_battery_level(
+                voltage_full=voltage_full, voltage_low=voltage_low
+            )
+
+        if signal:
+            values["device_rssi"] = float(signal.get("device_rssi", 0))
+            values["hub_rssi"] = float(signal.get("hub_rssi", 0))
+
+    if surepy_entity.type in [EntityType.CAT_FLAP, EntityType.PET_FLAP]:
+        if (locking := status.get("locking")) is not None:
+            values["lock_state"] = LockState(locking["mode"]).name.casefold()
+        values["learn_mode"] = bool(status.get("learn_mode"))
+
+    elif surepy_entity.type == EntityType.FELAQUA:
+        # an empty felaqua is a level as well
+        if (remaining := surepy_entity.water_remaining) is not None:
+            values["water_remaining"] = int(remaining)
+
+    elif surepy_entity.type == EntityType.FEEDER:
+        # index of the bowls of a feeder, looked up by every bowl sensor
+        values["bowl_weights"] = MappingProxyType(
+            {
+                int(index): int(bowl.weight)
+                for index, bowl in surepy_entity.bowls.items()
+                if bowl.weight is not None
+            }
+        )
+        if (total_weight := surepy_entity.total_weight) is not None:
+            values["total_weight"] = int(total_weight)
+
+    return EntityView(
+        id=int(surepy_entity.id),
+        household_id=int(surepy_entity.household_id),
+        name=str(surepy_entity.name or ""),
+        available=bool(status),
+        online=bool(status.get("online")),
+        attributes=MappingProxyType(
+            profile_attributes(attribute_profile, surepy_entity)
+        ),
+        **values,
+    )